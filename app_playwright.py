@@ -1,149 +1,82 @@
 # 필요한 라이브러리 설치
 
+import time
+from startup_timer import StartupTimer
+
+# 시작 단계별 소요 시간 (import → 크롤러 → UI → 서버, 모델은 백그라운드 로딩)
+startup_timer = StartupTimer()
+
 import gradio as gr
-from transformers import pipeline
+import sentiment
+from sentiment import UNCERTAIN_THRESHOLD, analyze_sentiment_batch, analyze_sentiment_batch_async
 import asyncio
-from playwright.async_api import async_playwright
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-import time
-import random
-from urllib.parse import quote
-import re
-from ptpython.repl import embed
-
-print("🤖 한국어 감정 분석 모델 로딩 중...")
-# 1️⃣ 한국어 감정 분석 파이프라인 생성
-try:
-    sentiment_pipeline = pipeline("sentiment-analysis", model="WhitePeak/bert-base-cased-Korean-sentiment")
-except Exception as e:
-    print(f"모델 로딩 실패: {e}")
-    print("대안 모델을 사용합니다...")
-    sentiment_pipeline = pipeline("sentiment-analysis", model="cardiffnlp/twitter-roberta-base-sentiment-latest")
-
-print("✅ 모델 로딩 완료!")
-
-# 2️⃣ 네이버 영화 리뷰 크롤링 함수
-async def crawl_naver_movie_reviews(movie_title, max_reviews=10):
-    reviews = []
+import os
+from crawlers import MAX_REVIEWS_LIMIT, REVIEW_WAIT_TIMEOUT, CrawlerChain
+from review_cache import ReviewCache, normalize_title
+import aspects
+from review_store import INCREMENTAL_CRAWL_ENABLED, TREND_ROLLING_DAYS, ReviewStore, review_hash
+from contextlib import aclosing
+from inference_pool import INFERENCE_WORKERS, InferencePool
+import metrics
+from metrics import CRAWLED_REVIEWS, RequestTrace
 
-    async with async_playwright() as p:
-        # Chromium 브라우저 실행 (headless = True 기본값)
-        # browser = await p.chromium.launch()
-        browser = await p.chromium.launch(
-            headless=True,        # GUI 없이 실행
-            args=["--no-sandbox"] # Spaces에서 필수 옵션
-        )
-        page = await browser.new_page()
-
-        # 영화 리뷰 검색 URL
-        search_url = f"https://search.naver.com/search.naver?query=영화 {movie_title} 평점"
-        await page.goto(search_url)
-
-        # 페이지 로딩 대기
-        await page.wait_for_timeout(2000)
-
-        # 리뷰 요소 찾기 (최대 max_reviews 개)
-        review_elements = await page.query_selector_all(".area_review_content .desc._text")
-
-        for elem in review_elements[:max_reviews]:
-            text = await elem.inner_text()
-            reviews.append(text.strip())
-
-        await browser.close()
-
-    return reviews, f"✅ {len(reviews)}개의 리뷰를 수집했습니다."
-
-
-# 3️⃣ 샘플 리뷰 데이터 (크롤링 실패 시 사용)
-sample_reviews = {
-    "기생충": [
-        "정말 충격적이고 인상 깊은 영화였어요. 봉준호 감독의 연출력이 돋보입니다.",
-        "사회 계층 간의 갈등을 너무나 현실적으로 그려낸 작품이네요.",
-        "예상치 못한 반전과 긴장감이 계속 이어져서 몰입도가 높았습니다.",
-        "배우들의 연기력이 정말 뛰어나고 스토리텔링도 완벽해요.",
-        "좀 과장된 면이 있긴 하지만 전체적으로는 만족스러운 영화입니다."
-    ],
-    "타이타닉": [
-        "로맨틱한 사랑 이야기와 웅장한 스케일이 인상적이었어요.",
-        "레오나르도 디카프리오와 케이트 윈슬렛의 케미가 정말 좋았습니다.",
-        "너무 길고 뻔한 스토리라 조금 지루했어요.",
-        "특수효과와 음악이 정말 대단하고 감동적이었습니다.",
-        "클래식한 멜로 영화의 대표작이라고 할 수 있겠네요."
-    ]
-}
+startup_timer.record("라이브러리 import", time.perf_counter() - startup_timer.started)
 
-def get_sample_reviews(movie_title, max_reviews=10):
-    """샘플 리뷰 반환 (크롤링 실패 시 대체용)"""
-    for key in sample_reviews.keys():
-        if key in movie_title or movie_title in key:
-            return sample_reviews[key][:max_reviews], f"✅ 샘플 데이터 {len(sample_reviews[key][:max_reviews])}개를 사용합니다."
-    
-    # 기본 샘플 리뷰
-    default_reviews = [
-        "정말 재미있는 영화였어요. 추천합니다!",
-        "스토리는 괜찮았는데 연출이 아쉬웠어요.",
-        "배우들의 연기가 인상적이었습니다.",
-        "예상보다 지루했지만 나쁘지 않았어요.",
-        "볼만한 영화입니다. 시간 가는 줄 몰랐어요."
-    ]
-    return default_reviews, "✅ 기본 샘플 데이터를 사용합니다."
+# 2️⃣ 네이버 영화 리뷰 수집 함수
+# 앱 전체에서 공유하는 크롤러 체인 (백엔드와 순서는 CRAWLER_CHAIN 설정, 브라우저/드라이버 풀은 각 백엔드가 관리)
+crawler_chain = CrawlerChain()
 
-# 4️⃣ 감정 분석 함수 개선
-def analyze_sentiment_batch(reviews):
-    """여러 리뷰를 한번에 감정 분석"""
-    results = []
-    
-    for review in reviews:
-        try:
-            result = sentiment_pipeline(review)[0]
-            label = result['label']
-            score = result['score']
-            
-            # 레이블 정규화
-            if label in ["LABEL_1", "POSITIVE", "positive"]:
-                sentiment = "긍정"
-                emoji = "😊"
-            else:
-                sentiment = "부정"
-                emoji = "😞"
+def _crawl_message(backend, review_count, first_review_time, reused_count=0):
+    if not review_count and not reused_count:
+        return f"⏱️ {REVIEW_WAIT_TIMEOUT:.0f}초 안에 리뷰를 찾지 못했습니다."
+    if backend == "sample":
+        return f"✅ 샘플 데이터 {review_count}개를 사용합니다."
+    if reused_count:
+        return (f"✅ 새 리뷰 {review_count}개를 수집해 이전에 분석한 리뷰 {reused_count}개와 합쳤습니다. "
+                f"({backend}, 첫 리뷰까지 {first_review_time:.2f}초)")
+    return f"✅ {review_count}개의 리뷰를 수집했습니다. ({backend}, 첫 리뷰까지 {first_review_time:.2f}초)"
 
-            
-            results.append({
-                "review": review,
-                "sentiment": sentiment,
-                "emoji": emoji,
-                "score": score,
-                "confidence": f"{score:.1%}"
-            })
-            
-        except Exception as e:
-            results.append({
-                "review": review,
-                "sentiment": "오류",
-                "emoji": "❓",
-                "score": 0.0,
-                "confidence": "0%"
-            })
-    
-    return results
+# 4️⃣ 결과 프레임 (리뷰가 수만 개여도 집계/차트/테이블을 열 단위 연산으로 처리)
+RESULT_COLUMNS = ["review", "sentiment", "emoji", "score", "confidence", "probs"]
+# 상세 결과 테이블 한 페이지의 행 수
+RESULTS_PAGE_SIZE = int(os.environ.get("RESULTS_PAGE_SIZE", "50"))
+REVIEW_PREVIEW_LENGTH = 50
+
+def results_frame(results):
+    """결과 딕셔너리 목록을 DataFrame으로 한 번만 변환 (이미 DataFrame이면 그대로)"""
+    # pandas는 처음 결과를 만들 때 import (앱 시작 속도)
+    import pandas as pd
+
+    if isinstance(results, pd.DataFrame):
+        return results
+    frame = pd.DataFrame.from_records(results, columns=RESULT_COLUMNS)
+    # 최고 확률이 기준보다 낮은 리뷰 (분석 오류는 제외)
+    frame['uncertain'] = (frame['score'] < UNCERTAIN_THRESHOLD) & (frame['sentiment'] != "오류")
+    return frame
+
+def sentiment_counts(frame):
+    """긍정/부정/불확실 개수를 한 번에 집계"""
+    counts = frame['sentiment'].value_counts()
+    return {
+        "긍정": int(counts.get("긍정", 0)),
+        "부정": int(counts.get("부정", 0)),
+        "불확실": int(frame['uncertain'].sum()),
+    }
 
 # 5️⃣ 시각화 함수
-def create_sentiment_chart(results):
+def create_sentiment_chart(results, counts=None):
     """감정 분석 결과를 파이 차트로 시각화"""
+    # plotly는 처음 차트를 그릴 때 import (앱 시작 속도)
+    import plotly.graph_objects as go
     
     # 감정별 카운트
-    sentiment_counts = {"긍정": 0, "부정": 0}
-    
-    for result in results:
-        if result['sentiment'] in sentiment_counts:
-            sentiment_counts[result['sentiment']] += 1
+    if counts is None:
+        counts = sentiment_counts(results_frame(results))
     
-    # 0인 항목 제거
-    sentiment_counts = {k: v for k, v in sentiment_counts.items() if v > 0}
+    # 0인 항목 제거 (불확실은 긍정/부정과 겹치므로 도넛에는 넣지 않음)
+    counts = {k: counts[k] for k in ("긍정", "부정") if counts[k] > 0}
     
-    if not sentiment_counts:
+    if not counts:
         return None
     
     # 색상 설정
@@ -152,10 +85,10 @@ def create_sentiment_chart(results):
     # Plotly 파이 차트 생성
     fig = go.Figure(data=[
         go.Pie(
-            labels=list(sentiment_counts.keys()),
-            values=list(sentiment_counts.values()),
+            labels=list(counts.keys()),
+            values=list(counts.values()),
             hole=0.4,  # 도넛 차트
-            marker=dict(colors=[colors.get(k, "#999") for k in sentiment_counts.keys()]),
+            marker=dict(colors=[colors.get(k, "#999") for k in counts.keys()]),
             textinfo='label+percent+value',
             textfont=dict(size=14),
             hovertemplate='<b>%{label}</b><br>개수: %{value}<br>비율: %{percent}<extra></extra>'
@@ -164,7 +97,7 @@ def create_sentiment_chart(results):
     
     fig.update_layout(
         title={
-            'text': f"🎬 감정 분석 결과 (총 {sum(sentiment_counts.values())}개 리뷰)",
+            'text': f"🎬 감정 분석 결과 (총 {sum(counts.values())}개 리뷰)",
             'x': 0.5,
             'font': {'size': 18}
         },
@@ -176,72 +109,756 @@ def create_sentiment_chart(results):
     
     return fig
 
+def create_score_histogram(results, bins=20):
+    """신뢰도(최고 확률) 분포를 긍정/부정별 누적 막대로 그리고 불확실 기준선을 표시"""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    frame = results_frame(results)
+    frame = frame[frame['sentiment'] != "오류"]
+    if frame.empty:
+        return None
+
+    edges = np.linspace(0, 1, bins + 1)
+    centers = (edges[:-1] + edges[1:]) / 2 * 100
+    colors = {"긍정": "#4CAF50", "부정": "#F44336"}
+
+    fig = go.Figure()
+    for label, color in colors.items():
+        counts, _ = np.histogram(frame.loc[frame['sentiment'] == label, 'score'].to_numpy(), bins=edges)
+        fig.add_trace(go.Bar(
+            name=label,
+            x=centers,
+            y=counts,
+            width=100 / bins,
+            marker_color=color,
+            hovertemplate=f'<b>{label}</b><br>신뢰도 %{{x:.0f}}% 부근: %{{y}}개<extra></extra>'
+        ))
+
+    uncertain = int(frame['uncertain'].sum())
+    fig.add_vline(
+        x=UNCERTAIN_THRESHOLD * 100,
+        line_dash="dash",
+        line_color="#FF9800",
+        annotation_text=f"🤔 불확실 {uncertain}개 (<{UNCERTAIN_THRESHOLD:.0%})",
+        annotation_position="top left"
+    )
+    fig.update_layout(
+        title={
+            'text': "📊 신뢰도 분포",
+            'x': 0.5,
+            'font': {'size': 18}
+        },
+        barmode='stack',
+        bargap=0.05,
+        font=dict(family="Arial, sans-serif", size=12),
+        xaxis=dict(title="신뢰도 (%)", range=[0, 100]),
+        yaxis=dict(title="리뷰 수"),
+        height=400,
+        margin=dict(t=80, b=40, l=40, r=40)
+    )
+
+    return fig
+
+def create_comparison_chart(summaries):
+    """여러 영화의 긍정/부정 비율을 가로 누적 막대 차트로 비교"""
+    import plotly.graph_objects as go
+
+    summaries = [s for s in summaries if s['total'] > 0]
+    if not summaries:
+        return None
+
+    # 긍정 비율이 높은 영화가 위에 오도록 정렬
+    summaries = sorted(summaries, key=lambda s: s['positive_ratio'])
+    titles = [s['title'] for s in summaries]
+
+    fig = go.Figure(data=[
+        go.Bar(
+            name="긍정",
+            y=titles,
+            x=[s['positive_ratio'] * 100 for s in summaries],
+            orientation='h',
+            marker_color="#4CAF50",
+            customdata=[s['positive'] for s in summaries],
+            hovertemplate='<b>%{y}</b><br>긍정: %{customdata}개 (%{x:.1f}%)<extra></extra>'
+        ),
+        go.Bar(
+            name="부정",
+            y=titles,
+            x=[s['negative_ratio'] * 100 for s in summaries],
+            orientation='h',
+            marker_color="#F44336",
+            customdata=[s['negative'] for s in summaries],
+            hovertemplate='<b>%{y}</b><br>부정: %{customdata}개 (%{x:.1f}%)<extra></extra>'
+        )
+    ])
+
+    fig.update_layout(
+        barmode='stack',
+        title={
+            'text': f"🎬 영화별 감정 비교 ({len(summaries)}편)",
+            'x': 0.5,
+            'font': {'size': 18}
+        },
+        xaxis=dict(title="비율 (%)", range=[0, 100]),
+        font=dict(family="Arial, sans-serif", size=12),
+        height=max(400, 30 * len(summaries) + 120),
+        margin=dict(t=80, b=40, l=40, r=40)
+    )
+
+    return fig
+
+def create_trend_chart(trend, movie_title):
+    """날짜별 리뷰 수(막대)와 긍정 비율, 이동 평균(선)을 한 차트에 표시"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    if not trend:
+        return None
+
+    days = [point['day'] for point in trend]
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(
+        go.Bar(
+            name="리뷰 수",
+            x=days,
+            y=[point['total'] for point in trend],
+            marker_color="#B0BEC5",
+            opacity=0.6,
+            hovertemplate='%{x}<br>리뷰 수: %{y}개<extra></extra>'
+        ),
+        secondary_y=True
+    )
+    fig.add_trace(
+        go.Scatter(
+            name="긍정 비율",
+            x=days,
+            y=[point['positive_ratio'] * 100 for point in trend],
+            mode='lines+markers',
+            line=dict(color="#4CAF50", width=1),
+            hovertemplate='%{x}<br>긍정 비율: %{y:.1f}%<extra></extra>'
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            name=f"{TREND_ROLLING_DAYS}일 이동 평균",
+            x=days,
+            y=[point['rolling_ratio'] * 100 for point in trend],
+            mode='lines',
+            line=dict(color="#1B5E20", width=3),
+            hovertemplate='%{x}<br>이동 평균: %{y:.1f}%<extra></extra>'
+        )
+    )
+
+    fig.update_layout(
+        title={
+            'text': f"📈 '{movie_title}' 감정 추이",
+            'x': 0.5,
+            'font': {'size': 18}
+        },
+        font=dict(family="Arial, sans-serif", size=12),
+        hovermode='x unified',
+        legend=dict(orientation='h', y=-0.15),
+        height=450,
+        margin=dict(t=80, b=60, l=40, r=40)
+    )
+    fig.update_yaxes(title_text="긍정 비율 (%)", range=[0, 100], secondary_y=False)
+    fig.update_yaxes(title_text="리뷰 수", showgrid=False, secondary_y=True)
+
+    return fig
+
+def create_aspect_chart(aspect_rows, movie_title):
+    """항목(연기·스토리·연출·음악 …)마다 긍정/부정 문장 비율을 도넛 차트로 나란히 표시"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # 한 번도 언급되지 않은 항목은 빼고 그림
+    rows = [row for row in aspect_rows if row['mentions'] > 0]
+    if not rows:
+        return None
+
+    fig = make_subplots(
+        rows=1,
+        cols=len(rows),
+        specs=[[{"type": "domain"}] * len(rows)],
+        subplot_titles=[f"{row['aspect']} ({row['mentions']}문장)" for row in rows]
+    )
+    for col, row in enumerate(rows, 1):
+        fig.add_trace(
+            go.Pie(
+                name=row['aspect'],
+                labels=["긍정", "부정"],
+                values=[row['positive'], row['negative']],
+                hole=0.4,
+                marker=dict(colors=["#4CAF50", "#F44336"]),
+                sort=False,
+                textinfo='percent',
+                hovertemplate=f"<b>{row['aspect']}</b> · %{{label}}<br>문장 수: %{{value}}<br>비율: %{{percent}}<extra></extra>"
+            ),
+            row=1,
+            col=col
+        )
+
+    fig.update_layout(
+        title={
+            'text': f"🎭 '{movie_title}' 항목별 감정",
+            'x': 0.5,
+            'font': {'size': 18}
+        },
+        font=dict(family="Arial, sans-serif", size=12),
+        legend=dict(orientation='h', y=-0.1),
+        height=400,
+        margin=dict(t=100, b=40, l=20, r=20)
+    )
+
+    return fig
+
 # 6️⃣ 결과 테이블 생성 함수
-def create_results_table(results):
-    """분석 결과를 테이블 형태로 정리"""
-    
+RESULT_TABLE_HEADERS = ["순번", "리뷰 내용", "감정", "신뢰도"]
+
+def page_count(results, page_size=RESULTS_PAGE_SIZE):
+    return max(1, -(-len(results) // page_size))
+
+def create_results_table(results, page=1, page_size=RESULTS_PAGE_SIZE):
+    """분석 결과 중 page번째 페이지만 테이블(DataFrame)로 정리"""
+    import pandas as pd
+
+    frame = results_frame(results)
+    page = min(max(1, int(page)), page_count(frame, page_size))
+    start = (page - 1) * page_size
+    rows = frame.iloc[start:start + page_size]
+
+    # 잘라내기/문자열 합치기는 보여줄 페이지 행에만 열 단위로 적용
+    reviews = rows['review']
+    preview = reviews.str.slice(0, REVIEW_PREVIEW_LENGTH)
+    preview = preview.where(reviews.str.len() <= REVIEW_PREVIEW_LENGTH, preview + "...")
+    label = rows['emoji'] + " " + rows['sentiment']
+    label = label.where(~rows['uncertain'], label + " 🤔")
+    return pd.DataFrame({
+        # 불확실한 리뷰만 걸러 보더라도 원래 순번을 유지
+        "순번": [f" {i}" for i in rows.index + 1],
+        "리뷰 내용": preview.to_numpy(),
+        "감정": label.to_numpy(),
+        "신뢰도": rows['confidence'].to_numpy(),
+    }, columns=RESULT_TABLE_HEADERS)
+
+def page_message(results, page, page_size=RESULTS_PAGE_SIZE, label="리뷰"):
+    return f"{page} / {page_count(results, page_size)} 페이지 · 총 {len(results)}개 {label}"
+
+def summarize_title(movie_title, results, crawl_msg=None, error=None):
+    """영화 한 편의 분석 결과를 비교용 요약(dict)으로 정리"""
+    frame = results_frame(results)
+    counts = sentiment_counts(frame)
+    positive, negative = counts["긍정"], counts["부정"]
+    total = positive + negative
+    return {
+        'title': movie_title,
+        'reviews': len(frame),
+        'positive': positive,
+        'negative': negative,
+        'total': total,
+        'positive_ratio': positive / total if total else 0.0,
+        'negative_ratio': negative / total if total else 0.0,
+        'avg_score': float(frame['score'].mean()) if len(frame) else 0.0,
+        'message': f"❌ {error}" if error else (crawl_msg or "❌ 리뷰 없음")
+    }
+
+def create_comparison_table(summaries):
+    """영화별 요약을 비교 테이블로 정리 (긍정 비율 높은 순)"""
     table_data = []
-    for i, result in enumerate(results, 1):
+    ranked = sorted(summaries, key=lambda s: (s['total'] > 0, s['positive_ratio']), reverse=True)
+    for i, summary in enumerate(ranked, 1):
         table_data.append([
             f" {i}",
-            result['review'][:50] + ("..." if len(result['review']) > 50 else ""),
-            f"{result['emoji']} {result['sentiment']}",
-            result['confidence']
+            summary['title'],
+            summary['reviews'],
+            summary['positive'],
+            summary['negative'],
+            f"{summary['positive_ratio'] * 100:.1f}%" if summary['total'] else "-",
+            f"{summary['avg_score'] * 100:.1f}%" if summary['reviews'] else "-",
+            summary['message']
         ])
-    
+
+    return table_data
+
+def create_aspect_table(aspect_rows):
+    """항목별 언급 수와 긍정 비율 테이블 (언급 많은 순)"""
+    ranked = sorted(aspect_rows, key=lambda row: row['mentions'], reverse=True)
+    return [
+        [
+            row['aspect'],
+            row['reviews'],
+            row['mentions'],
+            row['positive'],
+            row['negative'],
+            f"{row['positive_ratio'] * 100:.1f}%" if row['mentions'] else "-",
+        ]
+        for row in ranked
+    ]
+
+def create_review_aspect_table(review_rows):
+    """리뷰별 문장 수와 항목별 감정 테이블 (긍정/부정이 섞인 리뷰는 🔀 표시)"""
+    table_data = []
+    for i, row in enumerate(review_rows, 1):
+        review = row['review']
+        preview = review[:REVIEW_PREVIEW_LENGTH] + "..." if len(review) > REVIEW_PREVIEW_LENGTH else review
+        aspect_labels = " · ".join(
+            f"{aspect} {'😊' if probability >= 0.5 else '😞'}" for aspect, probability in row['aspects'].items()
+        )
+        label = row['sentiment'] + (" 🔀" if row['mixed'] else "")
+        table_data.append([f" {i}", preview, row['sentences'], label, aspect_labels or "-"])
+
     return table_data
 
 # 7️⃣ 메인 분석 함수
-def analyze_movie_reviews(movie_title, max_reviews=10):
-    """영화 리뷰 수집 및 감정 분석 메인 함수"""
+# 제목별 분석 결과 캐시 (메모리 LRU + SQLite)
+review_cache = ReviewCache()
+# 제목별로 분석한 리뷰 저장소 (다시 수집할 때 새 리뷰만 분석)
+review_store = ReviewStore()
+metrics.register_cache("review", review_cache)
+metrics.register_cache("sentiment_memo", sentiment.sentiment_memo)
+# 여러 영화 동시 분석 시 한 번에 수집/분석하는 영화 수와 입력 가능한 최대 제목 수
+MULTI_TITLE_CONCURRENCY = int(os.environ.get("MULTI_TITLE_CONCURRENCY", "4"))
+MAX_TITLES = int(os.environ.get("MAX_TITLES", "100"))
+# 감정 분석 워커 프로세스 풀 (INFERENCE_WORKERS > 0일 때만 사용, 아니면 앱 프로세스의 스레드 풀에서 추론)
+inference_pool = InferencePool() if INFERENCE_WORKERS > 0 else None
+
+async def _analyze(reviews, trace):
+    """리뷰 감정 분석 (워커 풀이 있으면 다른 요청과 묶어 워커에서 실행)"""
+    with trace.stage("sentiment"):
+        if inference_pool is not None:
+            return await analyze_sentiment_batch_async(reviews, inference_pool.predict)
+        return await asyncio.get_running_loop().run_in_executor(None, analyze_sentiment_batch, reviews)
+
+def _model_ready():
+    return inference_pool.ready if inference_pool is not None else sentiment.is_ready()
+
+metrics.MODEL_READY.set_function(lambda: float(_model_ready()))
+
+async def _crawl_and_analyze(movie_title, max_reviews, trace):
+    """리뷰 수집 + 감정 분석을 진행하며 (지금까지의 결과, 수집 메시지, 진행 상황)을 yield
+
+    리뷰 묶음이 도착하는 대로 감정 분석을 시작해 수집과 분석을 겹치고,
+    묶음 분석이 끝날 때마다 중간 결과를 내보냅니다. 샘플 데이터가 아닌 결과만 캐시에 저장합니다.
+    시간 예산 안에 리뷰를 하나도 못 받으면 만료된 이전 결과, 그다음 저장소에 있는 이 제목의 리뷰,
+    그것도 없으면 샘플 데이터를 사용합니다. 저장소(SQLite) 조회/저장은 이벤트 루프를 막지 않도록
+    스레드에서 실행합니다.
+
+    이전에 분석한 리뷰는 다시 분석하지 않고, 이미 본 리뷰에 도달했고 저장된 결과로
+    max_reviews개를 채울 수 있으면 더 넘기지 않고 멈춘 뒤 저장된 결과와 합칩니다.
+    """
+    events = asyncio.Queue()
+    batch_results = {}  # 묶음 순번 → 감정 분석 결과 (수집 순서대로 합치기 위함)
+    review_count = 0
+    first_review_time = None
+    backend = None  # 리뷰를 가져온 크롤러 백엔드
+    stale = None  # 크롤링 실패 시 대신 쓰는 만료된 캐시 결과
+    stored = None  # 크롤링 실패 시 대신 쓰는 저장소의 이전 리뷰 결과
+    known = await asyncio.to_thread(review_store.known_hashes, movie_title) if INCREMENTAL_CRAWL_ENABLED else set()
+    page_order = []  # 이번 수집에서 본 리뷰 해시 (페이지 순서, 이미 분석한 리뷰 포함)
+
+    async def analyze(index, batch):
+        results = await _analyze(batch, trace)
+        await events.put(("analyzed", index, results))
+
+    async def crawl():
+        # 1단계: 리뷰 수집 + 2단계: 감정 분석
+        analyses = []
+        received = False
+        new_count = 0
+
+        async def consume(batches, incremental=False):
+            nonlocal received, new_count
+            async with aclosing(batches):
+                async for name, batch, elapsed in batches:
+                    received = True
+                    if incremental:
+                        hashes = [review_hash(review) for review in batch]
+                        page_order.extend(hashes)
+                        fresh = [review for review, digest in zip(batch, hashes) if digest not in known]
+                    else:
+                        fresh = batch
+                    CRAWLED_REVIEWS.labels("new").inc(len(fresh))
+                    CRAWLED_REVIEWS.labels("known").inc(len(batch) - len(fresh))
+                    new_count += len(fresh)
+                    await events.put(("crawled", name, (len(fresh), elapsed)))
+                    if fresh:
+                        analyses.append(asyncio.create_task(analyze(len(analyses), fresh)))
+                    # 이미 본 리뷰부터는 예전 리뷰이므로 저장된 결과로 채울 수 있으면 여기서 멈춤
+                    if len(fresh) < len(batch) and new_count + len(known) >= max_reviews:
+                        break
+
+        try:
+            with trace.stage("crawl"):
+                await consume(crawler_chain.stream(movie_title, max_reviews, fallback=False), incremental=True)
+                if not received:
+                    cached = await asyncio.to_thread(review_cache.get, movie_title, max_reviews, allow_stale=True)
+                    if cached is not None:
+                        await events.put(("stale", None, cached))
+                    else:
+                        saved = await asyncio.to_thread(review_store.latest_results, movie_title, max_reviews)
+                        if saved:
+                            await events.put(("stored", None, saved))
+                        else:
+                            await consume(crawler_chain.fallback(movie_title, max_reviews))
+            await asyncio.gather(*analyses)
+        finally:
+            for task in analyses:
+                task.cancel()
+            await events.put(("done", None, None))
+
+    def merged_results():
+        return [result for index in sorted(batch_results) for result in batch_results[index]]
+
+    crawler = asyncio.create_task(crawl())
+    try:
+        while True:
+            kind, value, extra = await events.get()
+            if kind == "done":
+                break
+            if kind == "stale":
+                stale = extra
+            elif kind == "stored":
+                stored = extra
+            elif kind == "crawled":
+                backend = value
+                count, elapsed = extra
+                review_count += count
+                if first_review_time is None:
+                    first_review_time = elapsed
+                    trace.observe("first_review", elapsed)
+                yield merged_results(), None, f"📥 {review_count}개 리뷰 수집 중..."
+            else:
+                batch_results[value] = extra
+                analyzed = sum(len(results) for results in batch_results.values())
+                yield merged_results(), None, f"🤖 {analyzed}/{review_count}개 리뷰 감정 분석 완료..."
+        # 수집/분석 중 발생한 예외를 그대로 전달
+        await crawler
+    finally:
+        crawler.cancel()
+
+    if stale is not None:
+        trace.source = "stale"
+        results, crawl_msg = stale
+        yield results, crawl_msg + " (수집 지연으로 이전 결과 사용)", None
+        return
+
+    if stored is not None:
+        trace.source = "store"
+        yield stored, f"⏱️ 리뷰를 수집하지 못해 이전에 저장한 리뷰 {len(stored)}개를 사용합니다.", None
+        return
+
+    results = merged_results()
+    if backend == "sample":
+        # 모든 크롤러가 실패해 샘플 데이터를 쓴 결과는 캐시/저장하지 않음
+        trace.source = "sample"
+        yield results, _crawl_message(backend, review_count, first_review_time), None
+        return
+
+    # 새로 분석한 리뷰를 저장하고, 이전에 분석한 리뷰가 있으면 저장소에서 최신순으로 합쳐 가져옴
+    reused_count = 0
+    if backend is not None:
+        await asyncio.to_thread(review_store.add_results, movie_title, results, page_order, backend)
+    if known and backend is not None:
+        results = await asyncio.to_thread(review_store.latest_results, movie_title, max_reviews)
+        reused_count = max(0, len(results) - review_count)
+    crawl_msg = _crawl_message(backend, review_count, first_review_time, reused_count)
+    if results:
+        await asyncio.to_thread(review_cache.set, movie_title, max_reviews, results, crawl_msg)
+    yield results, crawl_msg, None
+
+async def _analyze_title(movie_title, max_reviews):
+    """캐시를 확인한 뒤 리뷰 수집 + 감정 분석을 끝까지 진행해 (results, crawl_msg) 반환"""
+    trace = RequestTrace(movie_title, max_reviews)
+    try:
+        cached = await asyncio.to_thread(review_cache.get, movie_title, max_reviews)
+        if cached is not None:
+            trace.source = "cache"
+            results, crawl_msg = cached
+            crawl_msg += " (캐시)"
+        else:
+            results, crawl_msg = [], None
+            async for results, crawl_msg, progress in _crawl_and_analyze(movie_title, max_reviews, trace):
+                pass
+    except Exception as e:
+        trace.source = "error"
+        trace.finish(error=str(e))
+        raise
+
+    if not results:
+        trace.source = "empty"
+    trace.finish(reviews=len(results))
+    return results, crawl_msg
+
+async def analyze_movie_titles(titles, max_reviews=10, concurrency=MULTI_TITLE_CONCURRENCY):
+    """여러 영화를 최대 concurrency편씩 동시에 분석하고 끝나는 순서대로 요약(dict)을 yield
+
+    크롤러 체인(브라우저/드라이버 풀, HTTP 클라이언트)과 감정 분석 배치 경로(워커 풀)를 모든 제목이 함께 사용합니다.
+    한 제목이 실패해도 나머지는 계속 진행하고, 실패 내용은 요약의 message에 남깁니다.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(movie_title):
+        async with semaphore:
+            try:
+                results, crawl_msg = await _analyze_title(movie_title, max_reviews)
+                return summarize_title(movie_title, results, crawl_msg)
+            except Exception as e:
+                return summarize_title(movie_title, [], error=str(e))
+
+    tasks = [asyncio.create_task(run(title)) for title in titles]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def parse_titles(text):
+    """줄바꿈/쉼표로 구분된 영화 제목 목록 (표기만 다른 중복 제목은 하나로)"""
+    titles = []
+    seen = set()
+    for line in text.replace(",", "\n").splitlines():
+        title = line.strip()
+        key = normalize_title(title)
+        if title and key not in seen:
+            seen.add(key)
+            titles.append(title)
+    return titles
+
+def _summarize(movie_title, results, crawl_msg, trace):
+    """감정 분석 결과로 (요약, 차트, 신뢰도 분포, 첫 페이지 테이블, 결과 프레임) 생성"""
+    
+    # 결과는 한 번만 DataFrame으로 바꾸고 긍정/부정 개수도 한 번만 집계해 공유
+    frame = results_frame(results)
+    counts = sentiment_counts(frame)
+    
+    # 3단계: 시각화
+    with trace.stage("chart"):
+        chart = create_sentiment_chart(frame, counts)
+        histogram = create_score_histogram(frame)
+    
+    # 4단계: 결과 테이블
+    with trace.stage("table"):
+        table = create_results_table(frame)
+    
+    # 5단계: 요약 메시지 생성
+    with trace.stage("summary"):
+        summary = _summary_message(movie_title, len(frame), counts, crawl_msg)
+    
+    return summary, chart, histogram, table, frame
+
+def _summary_message(movie_title, review_count, counts, crawl_msg):
+    positive_count = counts["긍정"]
+    negative_count = counts["부정"]
+    
+    summary = f"""📊 '{movie_title}' 리뷰 감정 분석 결과
+
+        {crawl_msg}
+
+        📈 분석 결과:
+        • 😊 긍정: {positive_count}개 ({positive_count/review_count*100:.1f}%)
+        
+        • 😞 부정: {negative_count}개 ({negative_count/review_count*100:.1f}%)  
+
+        • 🤔 불확실 (신뢰도 {UNCERTAIN_THRESHOLD:.0%} 미만): {counts["불확실"]}개
+
+        💡 종합 평가: {'긍정적' if positive_count > negative_count else '부정적'} 반응"""
+    
+    return summary
+
+async def analyze_movie_reviews(movie_title, max_reviews=10):
+    """영화 리뷰 수집 및 감정 분석 메인 함수 (진행 상황과 중간 결과를 단계별로 yield)
+
+    (요약, 차트, 신뢰도 분포, 첫 페이지 테이블, 결과 프레임)을 yield하며, 결과 프레임은 페이지 이동에 씁니다.
+    """
     
     if not movie_title.strip():
-        return "❓ 영화 제목을 입력해주세요.", None, None
+        yield "❓ 영화 제목을 입력해주세요.", None, None, None, None
+        return
     
     # 진행 상태 표시
     status_msg = f"🔍 '{movie_title}' 영화 리뷰 검색 중..."
+    if not _model_ready():
+        status_msg += "\n⏳ 감정 분석 모델 준비 중... (첫 요청은 조금 더 걸립니다)"
+    yield status_msg, None, None, None, None
     
+    trace = RequestTrace(movie_title, max_reviews)
     try:
-        # 1단계: 리뷰 수집
-        # reviews, crawl_msg = crawl_naver_movie_reviews(movie_title, max_reviews)
-        reviews, crawl_msg = asyncio.run(crawl_naver_movie_reviews(movie_title, max_reviews=10))
+        # 같은 제목을 최근에 분석했다면 크롤링과 감정 분석을 건너뜀
+        cached = await asyncio.to_thread(review_cache.get, movie_title, max_reviews)
+        if cached is not None:
+            trace.source = "cache"
+            results, crawl_msg = cached
+            crawl_msg += " (캐시)"
+        else:
+            async for results, crawl_msg, progress in _crawl_and_analyze(movie_title, max_reviews, trace):
+                if progress is None:
+                    continue
+                # 중간 결과: 분석이 끝난 리뷰까지 차트와 테이블을 갱신
+                frame = results_frame(results) if results else None
+                chart = create_sentiment_chart(frame) if results else None
+                histogram = create_score_histogram(frame) if results else None
+                table = create_results_table(frame) if results else None
+                yield f"{status_msg}\n{progress}", chart, histogram, table, frame
+
+        if not results:
+            trace.source = "empty"
+            trace.finish(reviews=0)
+            yield "❌ 리뷰를 찾을 수 없습니다. 다른 영화 제목을 시도해보세요.", None, None, None, None
+            return
         
-        # 크롤링 실패 시 샘플 데이터 사용
-        if not reviews:
-            reviews, crawl_msg = get_sample_reviews(movie_title, max_reviews)
+        output = _summarize(movie_title, results, crawl_msg, trace)
+        trace.finish(reviews=len(results))
+        yield output
         
+    except Exception as e:
+        trace.source = "error"
+        trace.finish(error=str(e))
+        yield f"❌ 처리 중 오류가 발생했습니다: {str(e)}", None, None, None, None
+
+async def analyze_multiple_movies(titles_text, max_reviews=10):
+    """여러 영화 동시 분석 (제목이 끝날 때마다 비교 차트와 테이블을 갱신하며 yield)"""
+
+    titles = parse_titles(titles_text or "")
+    if not titles:
+        yield "❓ 영화 제목을 한 줄에 하나씩 입력해주세요.", None, None
+        return
+    if len(titles) > MAX_TITLES:
+        yield f"❓ 한 번에 최대 {MAX_TITLES}편까지 분석할 수 있습니다. (입력: {len(titles)}편)", None, None
+        return
+
+    status_msg = f"🔍 {len(titles)}편 동시 분석 중... (최대 {MULTI_TITLE_CONCURRENCY}편씩)"
+    if not _model_ready():
+        status_msg += "\n⏳ 감정 분석 모델 준비 중... (첫 요청은 조금 더 걸립니다)"
+    yield status_msg, None, None
+
+    summaries = []
+    async for summary in analyze_movie_titles(titles, max_reviews):
+        summaries.append(summary)
+        progress = f"{status_msg}\n✅ {len(summaries)}/{len(titles)}편 완료 (방금: {summary['title']})"
+        yield progress, create_comparison_chart(summaries), create_comparison_table(summaries)
+
+    analyzed = [s for s in summaries if s['total'] > 0]
+    report = f"📊 {len(titles)}편 중 {len(analyzed)}편 분석 완료"
+    if analyzed:
+        best = max(analyzed, key=lambda s: s['positive_ratio'])
+        worst = min(analyzed, key=lambda s: s['positive_ratio'])
+        report += (
+            f"\n\n😊 가장 긍정적: {best['title']} ({best['positive_ratio'] * 100:.1f}%)"
+            f"\n😞 가장 부정적: {worst['title']} ({worst['positive_ratio'] * 100:.1f}%)"
+        )
+    yield report, create_comparison_chart(summaries), create_comparison_table(summaries)
+
+def show_results_page(frame, page, uncertain_only=False):
+    """분석 결과 프레임에서 page번째 페이지 테이블, 페이지 번호, 페이지 정보 반환
+
+    uncertain_only면 신뢰도가 낮아 다시 확인할 리뷰만 보여줍니다 (모델을 다시 돌리지 않음).
+    """
+    if frame is None:
+        return None, 1, ""
+    if uncertain_only:
+        frame = frame[frame['uncertain']]
+    page = min(max(1, int(page or 1)), page_count(frame))
+    label = "불확실한 리뷰" if uncertain_only else "리뷰"
+    return create_results_table(frame, page), page, page_message(frame, page, label=label)
+
+def show_sentiment_trend(movie_title, days=90):
+    """저장된 날짜별 집계로 감정 추이 요약과 차트 반환 (크롤링하지 않음)"""
+    if not movie_title.strip():
+        return "❌ 영화 제목을 입력해주세요.", None
+
+    trend = review_store.daily_trend(movie_title, int(days))
+    if not trend:
+        return f"❌ '{movie_title}'의 최근 {int(days)}일 저장된 리뷰가 없습니다. 먼저 '영화 한 편' 탭에서 분석해주세요.", None
+
+    total = sum(point['total'] for point in trend)
+    positive = sum(point['positive'] for point in trend)
+    latest = trend[-1]
+    summary = f"""📈 '{movie_title}' 최근 {int(days)}일 감정 추이
+
+        • 리뷰를 수집한 날: {len(trend)}일 / 리뷰 {total}개
+        • 기간 전체 긍정 비율: {positive / total:.1%}
+        • 최근 {TREND_ROLLING_DAYS}일 이동 평균: {latest['rolling_ratio']:.1%} ({latest['day']} 기준)
+        """
+    return summary, create_trend_chart(trend, movie_title)
+
+async def _fetch_reviews(movie_title, max_reviews, trace):
+    """리뷰 전체 감정 분석 없이 리뷰 텍스트만 (리뷰 목록, 수집 메시지)로 반환
+
+    캐시에 분석 결과가 있으면 그 리뷰를 쓰고, 없으면 크롤링만 합니다.
+    크롤링에 실패하면 저장소의 이전 리뷰, 그것도 없으면 샘플 데이터를 사용합니다.
+    """
+    cached = await asyncio.to_thread(review_cache.get, movie_title, max_reviews)
+    if cached is not None:
+        results, crawl_msg = cached
+        return [result['review'] for result in results if result['sentiment'] != "오류"], crawl_msg + " (캐시)"
+
+    reviews = []
+    backend = None
+    first_review_time = None
+    with trace.stage("crawl"):
+        async for backend, batch, elapsed in crawler_chain.stream(movie_title, max_reviews, fallback=False):
+            if first_review_time is None:
+                first_review_time = elapsed
+                trace.observe("first_review", elapsed)
+            reviews.extend(batch)
         if not reviews:
-            return "❌ 리뷰를 찾을 수 없습니다. 다른 영화 제목을 시도해보세요.", None, None
-        
-        # 2단계: 감정 분석
-        status_msg += f"\n🤖 {len(reviews)}개 리뷰 감정 분석 중..."
-        results = analyze_sentiment_batch(reviews)
-        
-        # 3단계: 시각화
-        chart = create_sentiment_chart(results)
-        
-        # 4단계: 결과 테이블
-        table = create_results_table(results)
-        
-        # 5단계: 요약 메시지 생성
-        positive_count = sum(1 for r in results if r['sentiment'] == '긍정')
-        negative_count = sum(1 for r in results if r['sentiment'] == '부정')
-        
-        summary = f"""📊 '{movie_title}' 리뷰 감정 분석 결과
+            stored = await asyncio.to_thread(review_store.latest_results, movie_title, max_reviews)
+            if stored:
+                reviews = [result['review'] for result in stored]
+                return reviews, f"⏱️ 리뷰를 수집하지 못해 이전에 저장한 리뷰 {len(reviews)}개를 사용합니다."
+            async for backend, batch, elapsed in crawler_chain.fallback(movie_title, max_reviews):
+                reviews.extend(batch)
+    return reviews, _crawl_message(backend, len(reviews), first_review_time)
 
-        {crawl_msg}
+async def analyze_movie_aspects(movie_title, max_reviews=10):
+    """리뷰를 문장으로 나눠 항목별 감정을 분석하고 (요약, 항목 차트, 항목 테이블, 리뷰 테이블) 반환
 
-        📈 분석 결과:
-        • 😊 긍정: {positive_count}개 ({positive_count/len(results)*100:.1f}%)
-        
-        • 😞 부정: {negative_count}개 ({negative_count/len(results)*100:.1f}%)  
+    리뷰 전체를 분석하는 단계는 거치지 않고, 모든 리뷰의 문장을 한 목록으로 펼쳐
+    감정 분석을 한 번만 호출합니다.
+    """
+    if not movie_title.strip():
+        return "❓ 영화 제목을 입력해주세요.", None, None, None
 
-        💡 종합 평가: {'긍정적' if positive_count > negative_count else '부정적'} 반응"""
-        
-        return summary, chart, table
-        
+    trace = RequestTrace(movie_title, max_reviews)
+    trace.source = "aspect"
+    try:
+        reviews, crawl_msg = await _fetch_reviews(movie_title, max_reviews, trace)
+        if not reviews:
+            trace.finish(reviews=0)
+            return "❌ 리뷰를 찾을 수 없습니다. 다른 영화 제목을 시도해보세요.", None, None, None
+
+        sentences, offsets = aspects.flatten(reviews)
+        sentence_results = await _analyze(sentences, trace)
+        review_rows, aspect_rows = aspects.aggregate(reviews, sentences, offsets, sentence_results)
+        trace.finish(reviews=len(reviews), sentences=len(sentences))
     except Exception as e:
-        return f"❌ 처리 중 오류가 발생했습니다: {str(e)}", None, None
+        trace.finish(error=str(e))
+        return f"❌ 처리 중 오류가 발생했습니다: {str(e)}", None, None, None
+
+    mixed = sum(row['mixed'] for row in review_rows)
+    mentioned = [row for row in aspect_rows if row['mentions'] > 0]
+    aspect_lines = "\n".join(
+        f"        • {row['aspect']}: 긍정 {row['positive_ratio']:.1%} ({row['mentions']}문장 / 리뷰 {row['reviews']}개)"
+        for row in sorted(mentioned, key=lambda row: row['mentions'], reverse=True)
+    ) or "        • 항목 키워드가 나온 문장이 없습니다."
+    summary = f"""🎭 '{movie_title}' 항목별 감정 분석 결과
+
+        {crawl_msg}
+
+        ✂️ 리뷰 {len(reviews)}개 → 문장 {len(sentences)}개
+        🔀 긍정/부정 문장이 섞인 리뷰: {mixed}개
+
+        📈 항목별 긍정 비율:
+{aspect_lines}
+        """
+    return (
+        summary,
+        create_aspect_chart(aspect_rows, movie_title),
+        create_aspect_table(aspect_rows),
+        create_review_aspect_table(review_rows),
+    )
 
 # 8️⃣ Gradio 인터페이스 구성
 def create_app():
@@ -257,65 +874,255 @@ def create_app():
         **영화 제목을 입력하면 실제 사용자 리뷰를 수집하여 AI로 감정을 분석하고 결과를 시각적으로 보여드립니다.**
         """)
         
-        with gr.Row():
-            with gr.Column(scale=2):
-                movie_input = gr.Textbox(
-                    label="🎥 영화 제목",
-                    placeholder="예: 좀비딸, 기생충, 타이타닉...",
-                    lines=1
-                )
+        with gr.Tabs():
+            with gr.Tab("🎬 영화 한 편"):
+                with gr.Row():
+                    with gr.Column(scale=2):
+                        movie_input = gr.Textbox(
+                            label="🎥 영화 제목",
+                            placeholder="예: 좀비딸, 기생충, 타이타닉...",
+                            lines=1
+                        )
                 
-                review_count = gr.Slider(
-                    label="📊 분석할 리뷰 개수",
-                    minimum=5,
-                    maximum=10,
-                    value=10,
-                    step=1
-                )
+                        review_count = gr.Slider(
+                            label="📊 분석할 리뷰 개수",
+                            minimum=5,
+                            maximum=MAX_REVIEWS_LIMIT,
+                            value=10,
+                            step=5
+                        )
                 
-                analyze_btn = gr.Button("🔍 분석 시작", variant="primary", size="lg")
+                        analyze_btn = gr.Button("🔍 분석 시작", variant="primary", size="lg")
                 
-            with gr.Column(scale=1):
-                gr.Markdown("""
-                ### 💡 사용 팁
-                - 분석 완료까지 10-30초 소요됩니다.
-                """)
+                    with gr.Column(scale=1):
+                        gr.Markdown("""
+                        ### 💡 사용 팁
+                        - 분석 완료까지 10-30초 소요됩니다.
+                        - 수집·분석 진행 상황과 중간 결과가 바로바로 표시됩니다.
+                        """)
         
-        # 결과 출력 영역
-        with gr.Row():
-            with gr.Column(scale=1):
-                result_text = gr.Textbox(
-                    label="📊 분석 결과 요약",
-                    lines=8,
-                    max_lines=12
-                )
+                # 결과 출력 영역
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        result_text = gr.Textbox(
+                            label="📊 분석 결과 요약",
+                            lines=8,
+                            max_lines=12
+                        )
             
-            with gr.Column(scale=1):
-                sentiment_chart = gr.Plot(label="📈 감정 분포 차트")
+                    with gr.Column(scale=1):
+                        sentiment_chart = gr.Plot(label="📈 감정 분포 차트")
+
+                score_histogram = gr.Plot(label="📊 신뢰도 분포")
         
-        # 상세 결과 테이블
-        gr.Markdown("**📝 리뷰별 상세 분석 결과**")
-        result_table = gr.Dataframe(
-            headers=["순번", "리뷰 내용", "감정", "신뢰도"],
-            datatype=["str", "str", "str", "str"],
-            wrap=True,
-            interactive=False,
-            row_count=(1, "dynamic") 
-        )
+                # 상세 결과 테이블
+                gr.Markdown("**📝 리뷰별 상세 분석 결과**")
+                result_table = gr.Dataframe(
+                    headers=RESULT_TABLE_HEADERS,
+                    datatype=["str", "str", "str", "str"],
+                    wrap=True,
+                    interactive=False,
+                    row_count=(1, "dynamic") 
+                )
 
-        # 이벤트 핸들러
-        analyze_btn.click(
-            analyze_movie_reviews,
-            inputs=[movie_input, review_count],
-            outputs=[result_text, sentiment_chart, result_table]
-        )
+                # 결과 전체는 세션 상태에 DataFrame으로 두고 테이블에는 한 페이지씩만 보냄
+                results_state = gr.State()
+                with gr.Row():
+                    prev_page_btn = gr.Button("◀ 이전", size="sm")
+                    page_number = gr.Number(label="페이지", value=1, precision=0, minimum=1)
+                    next_page_btn = gr.Button("다음 ▶", size="sm")
+                    uncertain_only = gr.Checkbox(label=f"🤔 불확실한 리뷰만 보기 (신뢰도 {UNCERTAIN_THRESHOLD:.0%} 미만)")
+                page_info = gr.Markdown()
+
+                # 이벤트 핸들러
+                analyze_btn.click(
+                    analyze_movie_reviews,
+                    inputs=[movie_input, review_count],
+                    outputs=[result_text, sentiment_chart, score_histogram, result_table, results_state],
+                    concurrency_limit=None  # 비동기 핸들러이므로 여러 요청을 동시에 처리
+                )
         
-        movie_input.submit(
-            analyze_movie_reviews,
-            inputs=[movie_input, review_count],
-            outputs=[result_text, sentiment_chart, result_table]
-        )
+                movie_input.submit(
+                    analyze_movie_reviews,
+                    inputs=[movie_input, review_count],
+                    outputs=[result_text, sentiment_chart, score_histogram, result_table, results_state],
+                    concurrency_limit=None  # 비동기 핸들러이므로 여러 요청을 동시에 처리
+                )
+
+                # 새 결과가 오거나 필터를 바꾸면 첫 페이지로
+                results_state.change(
+                    lambda frame, only: show_results_page(frame, 1, only),
+                    inputs=[results_state, uncertain_only],
+                    outputs=[result_table, page_number, page_info]
+                )
+                uncertain_only.change(
+                    lambda frame, only: show_results_page(frame, 1, only),
+                    inputs=[results_state, uncertain_only],
+                    outputs=[result_table, page_number, page_info]
+                )
+                prev_page_btn.click(
+                    lambda frame, page, only: show_results_page(frame, (page or 1) - 1, only),
+                    inputs=[results_state, page_number, uncertain_only],
+                    outputs=[result_table, page_number, page_info]
+                )
+                next_page_btn.click(
+                    lambda frame, page, only: show_results_page(frame, (page or 1) + 1, only),
+                    inputs=[results_state, page_number, uncertain_only],
+                    outputs=[result_table, page_number, page_info]
+                )
+                page_number.submit(
+                    show_results_page,
+                    inputs=[results_state, page_number, uncertain_only],
+                    outputs=[result_table, page_number, page_info]
+                )
         
+            with gr.Tab("📋 여러 영화 비교"):
+                with gr.Row():
+                    with gr.Column(scale=2):
+                        titles_input = gr.Textbox(
+                            label="🎥 영화 제목 목록 (한 줄에 하나씩)",
+                            placeholder="좀비딸\n기생충\n타이타닉",
+                            lines=6
+                        )
+
+                        multi_review_count = gr.Slider(
+                            label="📊 영화별 분석할 리뷰 개수",
+                            minimum=5,
+                            maximum=MAX_REVIEWS_LIMIT,
+                            value=10,
+                            step=5
+                        )
+
+                        compare_btn = gr.Button("🔍 비교 분석 시작", variant="primary", size="lg")
+
+                    with gr.Column(scale=1):
+                        gr.Markdown(f"""
+                        ### 💡 사용 팁
+                        - 최대 {MAX_TITLES}편, {MULTI_TITLE_CONCURRENCY}편씩 동시에 분석합니다.
+                        - 영화별 분석이 끝나는 대로 비교 결과가 갱신됩니다.
+                        """)
+
+                compare_text = gr.Textbox(label="📊 비교 분석 요약", lines=5, max_lines=12)
+                compare_chart = gr.Plot(label="📈 영화별 감정 비교 차트")
+
+                gr.Markdown("**📝 영화별 비교 결과**")
+                compare_table = gr.Dataframe(
+                    headers=["순위", "영화", "리뷰 수", "긍정", "부정", "긍정 비율", "평균 신뢰도", "수집"],
+                    datatype=["str", "str", "number", "number", "number", "str", "str", "str"],
+                    wrap=True,
+                    interactive=False,
+                    row_count=(1, "dynamic")
+                )
+
+                compare_btn.click(
+                    analyze_multiple_movies,
+                    inputs=[titles_input, multi_review_count],
+                    outputs=[compare_text, compare_chart, compare_table],
+                    concurrency_limit=None,
+                    api_name="analyze_titles"  # /analyze_titles API 엔드포인트로도 호출 가능
+                )
+
+            with gr.Tab("📈 감정 추이"):
+                with gr.Row():
+                    with gr.Column(scale=2):
+                        trend_title_input = gr.Textbox(
+                            label="🎥 영화 제목",
+                            placeholder="이전에 분석한 영화 제목",
+                            lines=1
+                        )
+
+                        trend_days = gr.Slider(
+                            label="📅 조회 기간 (일)",
+                            minimum=7,
+                            maximum=365,
+                            value=90,
+                            step=1
+                        )
+
+                        trend_btn = gr.Button("📈 추이 보기", variant="primary", size="lg")
+
+                    with gr.Column(scale=1):
+                        gr.Markdown("""
+                        ### 💡 사용 팁
+                        - 지금까지 분석하며 저장한 리뷰로 날짜별 추이를 보여줍니다 (새로 크롤링하지 않음).
+                        - 같은 영화를 날마다 분석할수록 추이가 채워집니다.
+                        """)
+
+                trend_text = gr.Textbox(label="📊 추이 요약", lines=5, max_lines=8)
+                trend_chart = gr.Plot(label="📈 날짜별 감정 추이 차트")
+
+                trend_btn.click(
+                    show_sentiment_trend,
+                    inputs=[trend_title_input, trend_days],
+                    outputs=[trend_text, trend_chart],
+                    api_name="sentiment_trend"
+                )
+                trend_title_input.submit(
+                    show_sentiment_trend,
+                    inputs=[trend_title_input, trend_days],
+                    outputs=[trend_text, trend_chart]
+                )
+
+            with gr.Tab("🎭 항목별 감정"):
+                with gr.Row():
+                    with gr.Column(scale=2):
+                        aspect_title_input = gr.Textbox(
+                            label="🎥 영화 제목",
+                            placeholder="예: 좀비딸, 기생충, 타이타닉...",
+                            lines=1
+                        )
+
+                        aspect_review_count = gr.Slider(
+                            label="📊 분석할 리뷰 개수",
+                            minimum=5,
+                            maximum=MAX_REVIEWS_LIMIT,
+                            value=10,
+                            step=5
+                        )
+
+                        aspect_btn = gr.Button("🎭 항목별 분석", variant="primary", size="lg")
+
+                    with gr.Column(scale=1):
+                        gr.Markdown(f"""
+                        ### 💡 사용 팁
+                        - 리뷰를 문장으로 나눠 문장마다 감정을 분석합니다.
+                        - 문장에 나온 키워드로 항목({", ".join(aspects.ASPECT_KEYWORDS)})을 구분합니다.
+                        """)
+
+                aspect_text = gr.Textbox(label="📊 항목별 분석 요약", lines=8, max_lines=14)
+                aspect_chart = gr.Plot(label="🎭 항목별 감정 차트")
+
+                gr.Markdown("**📝 항목별 결과**")
+                aspect_table = gr.Dataframe(
+                    headers=["항목", "언급 리뷰 수", "문장 수", "긍정", "부정", "긍정 비율"],
+                    datatype=["str", "number", "number", "number", "number", "str"],
+                    interactive=False,
+                    row_count=(1, "dynamic")
+                )
+
+                gr.Markdown("**📝 리뷰별 결과**")
+                review_aspect_table = gr.Dataframe(
+                    headers=["순번", "리뷰 내용", "문장 수", "감정", "항목별 감정"],
+                    datatype=["str", "str", "number", "str", "str"],
+                    wrap=True,
+                    interactive=False,
+                    row_count=(1, "dynamic")
+                )
+
+                aspect_btn.click(
+                    analyze_movie_aspects,
+                    inputs=[aspect_title_input, aspect_review_count],
+                    outputs=[aspect_text, aspect_chart, aspect_table, review_aspect_table],
+                    concurrency_limit=None,
+                    api_name="analyze_aspects"
+                )
+                aspect_title_input.submit(
+                    analyze_movie_aspects,
+                    inputs=[aspect_title_input, aspect_review_count],
+                    outputs=[aspect_text, aspect_chart, aspect_table, review_aspect_table],
+                    concurrency_limit=None
+                )
+
         gr.Markdown("""
         ---
         ### ℹ️ 안내사항
@@ -326,10 +1133,32 @@ def create_app():
     return app
 
 # 앱 실행
-if __name__ == "__main__":
+def main():
     print("🚀 영화 리뷰 감정 분석기 시작...")
-    app = create_app()
-    app.launch(
-        share=True,  # 외부 접근 허용 (필요 시 False로 변경)
-        show_error=True
-    )
\ No newline at end of file
+    # 모델은 서버 시작과 동시에 백그라운드에서 로딩 (준비 전 요청은 로딩이 끝날 때까지 대기)
+    if inference_pool is not None:
+        inference_pool.start()
+    else:
+        sentiment.warm_up_in_background()
+    with startup_timer.phase("크롤러 준비"):
+        crawler_chain.start()
+    with startup_timer.phase("UI 구성"):
+        app = create_app()
+    try:
+        with startup_timer.phase("서버 시작"):
+            app.launch(
+                share=True,  # 외부 접근 허용 (필요 시 False로 변경)
+                show_error=True,
+                prevent_thread_lock=True
+            )
+            # Gradio가 띄운 FastAPI 앱에 Prometheus 지표 엔드포인트 추가
+            metrics.mount(app.app)
+        print(startup_timer.report())
+        app.block_thread()
+    finally:
+        crawler_chain.close()
+        if inference_pool is not None:
+            inference_pool.close()
+
+if __name__ == "__main__":
+    main()
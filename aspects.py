@@ -0,0 +1,147 @@
+# 문장 단위 감정 분석과 항목(연기·스토리·연출·음악 …)별 집계
+#
+# 긴 리뷰는 "배우 연기는 좋았는데 전개가 늘어진다"처럼 칭찬과 불만이 섞여 있고,
+# 리뷰 전체를 한번에 넣으면 모델 최대 길이에서 잘립니다. 리뷰를 문장으로 나눠
+# 모든 리뷰의 문장을 한 목록으로 펼쳐(flatten) 한번에 배치 추론한 뒤,
+# 리뷰별·항목별로 다시 묶어(unflatten) 집계합니다.
+
+import os
+import re
+import unicodedata
+
+# 문장 분리 설정 (환경 변수로 변경 가능)
+# 이보다 짧은 조각("ㅋㅋ", "진짜")은 앞 문장에 붙임
+MIN_SENTENCE_CHARS = int(os.environ.get("ASPECT_MIN_SENTENCE_CHARS", "4"))
+# 이보다 긴 문장은 쉼표/공백 기준으로 더 나눔 (모델 최대 길이에서 잘리지 않도록)
+MAX_SENTENCE_CHARS = int(os.environ.get("ASPECT_MAX_SENTENCE_CHARS", "200"))
+
+# 항목별 키워드 (문장에 키워드가 들어 있으면 해당 항목 문장으로 집계, 영문은 소문자로 비교)
+ASPECT_KEYWORDS = {
+    "연기": ["연기", "배우", "캐스팅", "열연", "주연", "조연", "배역", "케미"],
+    "스토리": ["스토리", "줄거리", "내용", "전개", "결말", "각본", "시나리오", "개연성", "반전", "서사"],
+    "연출": ["연출", "감독", "편집", "영상미", "촬영", "화면", "장면", "액션", "cg", "미장센"],
+    "음악": ["음악", "ost", "사운드", "노래", "배경음", "음향", "bgm"],
+}
+
+# 마침표/느낌표/물음표/말줄임/물결과 줄바꿈, 또는 "~다", "~요" 등으로 끝난 뒤의 공백에서 나눔
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?~…。])(?![.!?~…。\d])\s*|\n+|(?<=[가-힣][다요죠네])\s+")
+_SOFT_BOUNDARY = re.compile(r"(?<=[,;])\s*|\s+")
+
+
+def split_sentences(review):
+    """리뷰를 문장 목록으로 나눔 (짧은 조각은 앞 문장에 붙이고, 긴 문장은 더 나눔)"""
+    text = unicodedata.normalize("NFC", review)
+    sentences = []
+    for piece in _SENTENCE_BOUNDARY.split(text):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if sentences and len(piece) < MIN_SENTENCE_CHARS:
+            sentences[-1] = f"{sentences[-1]} {piece}"
+            continue
+        sentences.extend(_split_long(piece))
+    return sentences
+
+
+def _split_long(sentence):
+    """MAX_SENTENCE_CHARS를 넘는 문장은 쉼표/공백 기준으로 그 길이 이하 조각으로 나눔"""
+    if len(sentence) <= MAX_SENTENCE_CHARS:
+        return [sentence]
+    chunks, current = [], ""
+    for word in _SOFT_BOUNDARY.split(sentence):
+        if not word:
+            continue
+        if current and len(current) + len(word) + 1 > MAX_SENTENCE_CHARS:
+            chunks.append(current)
+            current = ""
+        current = f"{current} {word}" if current else word
+        while len(current) > MAX_SENTENCE_CHARS:
+            chunks.append(current[:MAX_SENTENCE_CHARS])
+            current = current[MAX_SENTENCE_CHARS:]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def find_aspects(sentence):
+    """문장에 언급된 항목 목록 (ASPECT_KEYWORDS 순서)"""
+    text = sentence.lower()
+    return [aspect for aspect, keywords in ASPECT_KEYWORDS.items() if any(k in text for k in keywords)]
+
+
+def flatten(reviews):
+    """리뷰 목록을 (전체 문장 목록, 경계) 로 펼침
+
+    i번째 리뷰의 문장은 sentences[offsets[i]:offsets[i + 1]] 입니다.
+    """
+    sentences, offsets = [], [0]
+    for review in reviews:
+        sentences.extend(split_sentences(review))
+        offsets.append(len(sentences))
+    return sentences, offsets
+
+
+def positive_probability(result):
+    """감정 분석 결과(dict)의 긍정 확률 (분석 오류면 None)"""
+    if result["sentiment"] == "긍정":
+        return result["score"]
+    if result["sentiment"] == "부정":
+        return 1.0 - result["score"]
+    return None
+
+
+def aggregate(reviews, sentences, offsets, sentence_results):
+    """문장별 감정 분석 결과를 리뷰별·항목별로 다시 묶어 (리뷰 목록, 항목 목록) 반환
+
+    리뷰 감정은 문장 길이로 가중 평균한 긍정 확률로 정하고, 긍정/부정 문장이
+    함께 있으면 mixed로 표시합니다. 항목은 키워드가 나온 문장 수로 집계합니다.
+    """
+    aspect_stats = {
+        aspect: {'aspect': aspect, 'reviews': 0, 'positive': 0, 'negative': 0, 'probability_sum': 0.0}
+        for aspect in ASPECT_KEYWORDS
+    }
+
+    review_rows = []
+    for i, review in enumerate(reviews):
+        weighted, weight = 0.0, 0
+        labels = set()
+        review_aspects = {}  # 항목 → 이 리뷰에서 해당 항목 문장들의 긍정 확률 목록
+        for sentence, result in zip(sentences[offsets[i]:offsets[i + 1]], sentence_results[offsets[i]:offsets[i + 1]]):
+            probability = positive_probability(result)
+            if probability is None:
+                continue
+            weighted += probability * len(sentence)
+            weight += len(sentence)
+            labels.add(result["sentiment"])
+            for aspect in find_aspects(sentence):
+                review_aspects.setdefault(aspect, []).append(probability)
+                stats = aspect_stats[aspect]
+                stats['positive' if probability >= 0.5 else 'negative'] += 1
+                stats['probability_sum'] += probability
+
+        for aspect in review_aspects:
+            aspect_stats[aspect]['reviews'] += 1
+        positive_ratio = weighted / weight if weight else None
+        review_rows.append({
+            'review': review,
+            'sentences': offsets[i + 1] - offsets[i],
+            'positive_ratio': positive_ratio,
+            'sentiment': "오류" if positive_ratio is None else ("긍정" if positive_ratio >= 0.5 else "부정"),
+            'mixed': len(labels) > 1,
+            'aspects': {aspect: sum(p) / len(p) for aspect, p in review_aspects.items()},
+        })
+
+    aspect_rows = []
+    for stats in aspect_stats.values():
+        mentions = stats['positive'] + stats['negative']
+        aspect_rows.append({
+            'aspect': stats['aspect'],
+            'reviews': stats['reviews'],
+            'mentions': mentions,
+            'positive': stats['positive'],
+            'negative': stats['negative'],
+            'positive_ratio': stats['positive'] / mentions if mentions else 0.0,
+            'avg_probability': stats['probability_sum'] / mentions if mentions else 0.0,
+        })
+    return review_rows, aspect_rows
+
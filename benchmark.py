@@ -0,0 +1,327 @@
+# 감정 분석 처리량 / 크롤러 지연 / 전체 분석 지연 벤치마크
+#
+# 예) python benchmark.py --output bench.json
+#     python benchmark.py --quick --compare bench.json   # 이전 결과와 비교
+#
+# 크롤러와 전체 분석은 실제 네이버 대신 benchmark_fixtures/의 저장된 검색 결과 HTML을
+# 로컬 서버로 띄워 측정하므로 네트워크 상태와 관계없이 같은 조건으로 반복할 수 있습니다.
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_fixtures", "naver_search.html")
+
+# 앱 모듈을 import하기 전에 설정: 디스크 메모/캐시/리뷰 저장소를 쓰지 않아 매 측정이 같은 조건이 되도록 함
+os.environ.pop("SENTIMENT_MEMO_PATH", None)
+BENCH_DIR = tempfile.mkdtemp(prefix="bench-")
+os.environ["REVIEW_CACHE_PATH"] = os.path.join(BENCH_DIR, "review_cache.sqlite3")
+os.environ["REVIEW_STORE_PATH"] = os.path.join(BENCH_DIR, "review_store.sqlite3")
+# 이전 측정에서 저장한 리뷰를 건너뛰면 수집+추론이 아니라 저장소 조회를 재게 되므로 끔
+os.environ["INCREMENTAL_CRAWL_ENABLED"] = "0"
+os.environ["REVIEW_CACHE_TTL"] = "0"
+os.environ["REVIEW_CACHE_STALE_TTL"] = "0"
+# 크롤링이 실패했을 때 샘플 데이터로 대신 측정되지 않도록 샘플 백엔드는 빼고 실행
+os.environ.setdefault("CRAWLER_CHAIN", "http,playwright")
+
+import sentiment
+
+# 리뷰 길이별 측정에 쓰는 문장 조각
+REVIEW_PHRASES = [
+    "배우들의 연기가 정말 자연스러웠어요.",
+    "스토리가 뻔해서 조금 지루했습니다.",
+    "연출과 음악이 잘 어울려서 몰입감이 대단했어요.",
+    "결말이 허무해서 아쉬움이 남네요.",
+    "가족과 함께 보기 좋은 따뜻한 영화입니다.",
+    "러닝타임이 너무 길게 느껴졌어요.",
+    "영상미가 아름다워서 극장에서 보길 잘했어요.",
+    "캐릭터들의 개연성이 부족했습니다.",
+]
+
+
+# 1️⃣ 측정 도구
+def percentiles(samples):
+    """지연 시간 목록(초)을 밀리초 단위 p50/p95/p99/평균/최소/최대로 요약"""
+    ordered = sorted(samples)
+
+    def rank(p):
+        # nearest-rank 방식
+        index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[index] * 1000
+
+    return {
+        "runs": len(ordered),
+        "p50_ms": rank(50),
+        "p95_ms": rank(95),
+        "p99_ms": rank(99),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def make_reviews(count, length, seed=0):
+    """length 글자 안팎의 서로 다른 리뷰 count개 생성 (같은 seed면 같은 리뷰)"""
+    rng = random.Random(seed)
+    reviews = []
+    for i in range(count):
+        text = f"{i}번 관람평:"
+        while len(text) < length:
+            text += " " + rng.choice(REVIEW_PHRASES)
+        reviews.append(text[:length])
+    return reviews
+
+
+def environment_info():
+    """결과를 비교할 때 필요한 실행 환경 정보"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    import torch
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "model": sentiment.sentiment_memo.model_key,
+        "backend": sentiment.backend,
+    }
+
+
+# 2️⃣ 감정 분석 처리량
+def bench_sentiment(batch_sizes, lengths, count, repeat):
+    """배치 크기 × 리뷰 길이 조합별 analyze_sentiment_batch 처리량 (리뷰/초)"""
+    sentiment.load_model()
+    # 첫 호출의 지연(스레드 풀 생성 등)이 측정에 섞이지 않도록 한 번 실행
+    sentiment.analyze_sentiment_batch(make_reviews(8, 50, seed=-1))
+
+    results = []
+    for length in lengths:
+        for batch_size in batch_sizes:
+            timings = []
+            for run in range(repeat):
+                reviews = make_reviews(count, length, seed=run)
+                # 메모에 남은 결과를 재사용하지 않도록 매번 비움
+                sentiment.sentiment_memo.clear()
+                started = time.perf_counter()
+                sentiment.analyze_sentiment_batch(reviews, batch_size=batch_size)
+                timings.append(time.perf_counter() - started)
+
+            best = min(timings)
+            results.append({
+                "batch_size": batch_size,
+                "length": length,
+                "reviews": count,
+                "best_seconds": best,
+                "reviews_per_sec": count / best,
+            })
+            print(f"  • 배치 {batch_size:>3} / 길이 {length:>4}자: {count / best:8.1f} 리뷰/초")
+    return results
+
+
+# 3️⃣ 저장된 검색 결과 HTML을 돌려주는 로컬 서버
+@contextmanager
+def fixture_server(path=FIXTURE_PATH):
+    """경로/쿼리와 관계없이 fixture HTML을 돌려주는 서버를 띄우고 검색 URL을 넘겨줌"""
+    with open(path, "rb") as f:
+        body = f.read()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, name="bench-fixture", daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/search.naver"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# 4️⃣ 크롤러 지연
+async def bench_http_crawler(runs, max_reviews):
+    """HTTP 크롤러로 fixture 검색 결과를 받아 파싱하기까지의 지연"""
+    from http_crawler import close_client, fetch_naver_movie_reviews
+
+    await fetch_naver_movie_reviews("벤치마크", max_reviews)  # 연결 준비
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        reviews = await fetch_naver_movie_reviews("벤치마크", max_reviews)
+        timings.append(time.perf_counter() - started)
+    await close_client()
+
+    print(f"  • HTTP: 리뷰 {len(reviews)}개")
+    return percentiles(timings)
+
+
+async def bench_browser_crawler(runs, max_reviews):
+    """Playwright 크롤러로 fixture 페이지를 열고 더보기로 max_reviews개를 모으기까지의 지연"""
+    from crawlers import PlaywrightCrawler
+
+    crawler = PlaywrightCrawler()
+
+    async def crawl():
+        reviews = []
+        async for batch in crawler.stream("벤치마크", max_reviews):
+            reviews.extend(batch)
+        return reviews
+
+    crawler.start()
+    try:
+        await crawl()  # 브라우저 예열
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            reviews = await crawl()
+            timings.append(time.perf_counter() - started)
+    finally:
+        crawler.close()
+
+    print(f"  • 브라우저: 리뷰 {len(reviews)}개")
+    return percentiles(timings)
+
+
+# 5️⃣ 전체 분석 지연 (수집 + 감정 분석 + 차트/테이블)
+async def bench_end_to_end(runs, max_reviews):
+    """analyze_movie_reviews를 끝까지 실행하는 데 걸리는 시간 (캐시/메모 없이)"""
+    from app_playwright import analyze_movie_reviews, crawler_chain
+
+    timings = []
+    try:
+        for run in range(runs + 1):
+            sentiment.sentiment_memo.clear()
+            started = time.perf_counter()
+            async for summary, *_ in analyze_movie_reviews("벤치마크", max_reviews):
+                pass
+            if run > 0:  # 첫 실행은 예열
+                timings.append(time.perf_counter() - started)
+    finally:
+        # HTTP로 리뷰가 모자라 브라우저 크롤러를 쓴 경우 정리
+        crawler_chain.close()
+
+    if summary.startswith("❌"):
+        raise RuntimeError(summary)
+    return percentiles(timings)
+
+
+# 6️⃣ 결과 저장 / 비교
+def flatten_metrics(report):
+    """커밋 간 비교용 {지표 이름: 값} (처리량은 높을수록, 지연은 낮을수록 좋음)"""
+    metrics = {}
+    for row in report.get("sentiment", []):
+        metrics[f"sentiment.batch{row['batch_size']}.len{row['length']}.reviews_per_sec"] = row["reviews_per_sec"]
+    for section in ("crawler_http", "crawler_browser", "end_to_end"):
+        stats = report.get(section)
+        if isinstance(stats, dict) and "p50_ms" in stats:
+            for key in ("p50_ms", "p95_ms", "p99_ms"):
+                metrics[f"{section}.{key}"] = stats[key]
+    return metrics
+
+
+def compare(report, baseline):
+    """두 결과의 공통 지표 변화를 출력"""
+    current, previous = flatten_metrics(report), flatten_metrics(baseline)
+    print(f"\n📊 비교 (기준: {baseline.get('environment', {}).get('commit')})")
+    for name in sorted(current.keys() & previous.keys()):
+        old, new = previous[name], current[name]
+        change = (new - old) / old * 100 if old else 0.0
+        better = change > 0 if name.endswith("per_sec") else change < 0
+        mark = "🟢" if better and abs(change) >= 5 else "🔴" if abs(change) >= 5 else "⚪"
+        print(f"  {mark} {name}: {old:.1f} → {new:.1f} ({change:+.1f}%)")
+
+
+def _run_section(report, name, coroutine):
+    """한 항목이 실패해도 (예: Chromium 미설치) 나머지 측정은 계속 진행"""
+    try:
+        report[name] = asyncio.run(coroutine)
+    except Exception as e:
+        print(f"  ⚠️ {name} 측정 실패: {e}")
+        report[name] = {"error": str(e)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="감정 분석/크롤러/전체 분석 성능을 측정합니다.")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 화면에만 출력)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--quick", action="store_true", help="조합과 반복 횟수를 줄여 빠르게 측정")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", help="측정할 배치 크기 (기본: 1 8 16 32 64)")
+    parser.add_argument("--lengths", type=int, nargs="+", help="측정할 리뷰 길이(글자) (기본: 20 100 300)")
+    parser.add_argument("--reviews", type=int, help="조합별 리뷰 수 (기본: 256)")
+    parser.add_argument("--runs", type=int, help="지연 측정 반복 횟수 (기본: 50)")
+    parser.add_argument("--max-reviews", type=int, default=10, help="크롤링/전체 분석 리뷰 수 (기본: 10)")
+    parser.add_argument("--browser-reviews", type=int, default=50, help="브라우저 크롤링 리뷰 수 (기본: 50)")
+    parser.add_argument("--skip", nargs="+", default=[],
+                        choices=["sentiment", "crawler_http", "crawler_browser", "end_to_end"],
+                        help="건너뛸 항목")
+    args = parser.parse_args(argv)
+
+    batch_sizes = args.batch_sizes or ([1, 16, 64] if args.quick else [1, 8, 16, 32, 64])
+    lengths = args.lengths or ([20, 300] if args.quick else [20, 100, 300])
+    count = args.reviews or (64 if args.quick else 256)
+    runs = args.runs or (10 if args.quick else 50)
+
+    report = {}
+    with fixture_server() as url:
+        # 앱 모듈은 검색 URL을 바꾼 뒤에 import되어야 함
+        os.environ["NAVER_SEARCH_URL"] = url
+
+        if "sentiment" not in args.skip:
+            print("🤖 감정 분석 처리량")
+            report["sentiment"] = bench_sentiment(batch_sizes, lengths, count, repeat=1 if args.quick else 3)
+        if "crawler_http" not in args.skip:
+            print("🌐 HTTP 크롤러 지연")
+            _run_section(report, "crawler_http", bench_http_crawler(runs, args.max_reviews))
+        if "crawler_browser" not in args.skip:
+            print("🌐 브라우저 크롤러 지연")
+            _run_section(report, "crawler_browser",
+                         bench_browser_crawler(max(1, runs // 5), args.browser_reviews))
+        if "end_to_end" not in args.skip:
+            print("⏱️ 전체 분석 지연")
+            _run_section(report, "end_to_end", bench_end_to_end(runs, args.max_reviews))
+
+    report["environment"] = environment_info()
+    report["metrics"] = flatten_metrics(report)
+    print(json.dumps(report["metrics"], ensure_ascii=False, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
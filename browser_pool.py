@@ -0,0 +1,252 @@
+# Playwright 브라우저 풀 (앱 시작 시 한번 띄워 요청마다 재사용)
+
+import asyncio
+import os
+import re
+import threading
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+# 풀 설정 (환경 변수로 변경 가능)
+POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", "2"))
+MAX_PAGES_PER_BROWSER = int(os.environ.get("BROWSER_MAX_PAGES", "100"))
+# 브라우저 하나에서 동시에 여는 최대 컨텍스트 수 (동시 크롤링 수 = 브라우저 수 × 이 값)
+CONTEXTS_PER_BROWSER = int(os.environ.get("BROWSER_CONTEXTS_PER_BROWSER", "4"))
+LAUNCH_ARGS = ["--no-sandbox"]  # Spaces에서 필수 옵션
+
+# 리뷰 텍스트와 무관한 리소스는 받지 않음 (이미지/폰트/미디어, 광고·통계 스크립트)
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_URL_PATTERN = re.compile(
+    r"(adcr|siape\.veta|lcs|nlog|tivan)\.naver\.com|wcs\.naver\.net"
+    r"|doubleclick\.net|google-analytics\.com|googletagmanager\.com|googlesyndication\.com"
+)
+
+
+async def _block_resources(route):
+    """불필요한 요청은 중단하고 나머지는 그대로 진행"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PATTERN.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _StreamError:
+    """stream()에서 크롤링 중 발생한 예외를 호출한 쪽으로 전달하기 위한 래퍼"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+_STREAM_DONE = object()
+
+
+class _PooledBrowser:
+    """풀에 들어있는 브라우저와 지금까지 연 컨텍스트 수, 지금 사용 중인 컨텍스트 수"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = 0
+        self.active = 0
+
+
+_LAUNCHING = object()  # 새 브라우저를 띄우는 중인 자리
+
+
+class BrowserPool:
+    """Chromium 브라우저를 미리 띄워두고 요청마다 격리된 BrowserContext를 빌려주는 풀
+
+    Playwright 객체는 생성한 이벤트 루프에서만 쓸 수 있으므로 풀 전용 루프를
+    백그라운드 스레드에서 돌리고, 크롤링은 stream()으로 그 루프에서 실행합니다.
+
+    브라우저 하나가 컨텍스트를 contexts_per_browser개까지 동시에 열어주고, 가장 한가한
+    브라우저부터 씁니다. max_pages개 컨텍스트를 연 브라우저(또는 죽은 브라우저)는 자리를
+    새 브라우저에 넘기고, 사용 중인 컨텍스트가 모두 끝난 뒤에 닫습니다.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_BROWSER, block_resources=True,
+                 contexts_per_browser=CONTEXTS_PER_BROWSER):
+        self.size = size
+        self.max_pages = max_pages
+        self.block_resources = block_resources
+        self.contexts_per_browser = contexts_per_browser
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._slots = []  # 자리별 _PooledBrowser (None: 비어 있음, _LAUNCHING: 띄우는 중)
+        self._retired = set()  # 자리를 넘겼지만 아직 사용 중인 컨텍스트가 남은 브라우저
+        self._available = None  # 컨텍스트 반납/브라우저 교체를 기다리는 Condition (풀 루프에서 생성)
+        self._lock = threading.Lock()
+
+    @property
+    def started(self):
+        return self._loop is not None
+
+    def start(self):
+        """풀 전용 이벤트 루프와 브라우저를 띄움 (여러 번 호출해도 한번만 실행)"""
+        with self._lock:
+            if self.started:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result()
+            except Exception:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+            self._loop, self._thread = loop, thread
+        print(f"🌐 브라우저 풀 준비 완료 (브라우저 {self.size}개, 브라우저당 동시 컨텍스트 {self.contexts_per_browser}개)")
+
+    def close(self):
+        """브라우저와 Playwright를 정리하고 풀 루프를 종료"""
+        with self._lock:
+            if not self.started:
+                return
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        asyncio.run_coroutine_threadsafe(self._close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def stream(self, crawl, *args, maxsize=4):
+        """crawl(page, *args) 비동기 제너레이터가 내놓는 값을 호출한 루프에서 차례로 yield
+
+        큐가 maxsize만큼 차면 소비자가 따라올 때까지 크롤링을 멈춥니다(백프레셔).
+        소비자가 중간에 멈추면 크롤링도 취소됩니다.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize)
+
+        async def forward(item):
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(queue.put(item), loop))
+
+        async def produce():
+            try:
+                async with self._page() as page:
+                    async for item in crawl(page, *args):
+                        await forward(item)
+                end = _STREAM_DONE
+            except Exception as e:
+                end = _StreamError(e)
+            await forward(end)
+
+        future = asyncio.run_coroutine_threadsafe(produce(), self._loop)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_DONE:
+                    return
+                if isinstance(item, _StreamError):
+                    raise item.error
+                yield item
+        finally:
+            future.cancel()
+
+    async def _start(self):
+        self._playwright = await async_playwright().start()
+        self._available = asyncio.Condition()
+        self._slots = [await self._launch() for _ in range(self.size)]
+
+    async def _close(self):
+        for entry in [*self._slots, *self._retired]:
+            if isinstance(entry, _PooledBrowser):
+                await self._close_browser(entry)
+        self._slots, self._retired = [], set()
+        await self._playwright.stop()
+
+    async def _launch(self):
+        browser = await self._playwright.chromium.launch(
+            headless=True,        # GUI 없이 실행
+            args=LAUNCH_ARGS
+        )
+        return _PooledBrowser(browser)
+
+    async def _close_browser(self, entry):
+        try:
+            await entry.browser.close()
+        except Exception:
+            pass
+
+    async def _retire_worn(self):
+        """죽었거나 max_pages개를 연 브라우저의 자리를 비우고, 사용 중인 컨텍스트가 없으면 바로 닫음"""
+        for i, entry in enumerate(self._slots):
+            if not isinstance(entry, _PooledBrowser):
+                continue
+            if entry.browser.is_connected() and entry.pages < self.max_pages:
+                continue
+            self._slots[i] = None
+            if entry.active:
+                self._retired.add(entry)
+            else:
+                await self._close_browser(entry)
+
+    async def _acquire(self):
+        """컨텍스트 자리가 남은 브라우저 중 가장 한가한 것을 골라 반환 (빈 자리에는 새 브라우저를 띄움)"""
+        async with self._available:
+            while True:
+                await self._retire_worn()
+                usable = [
+                    entry for entry in self._slots
+                    if isinstance(entry, _PooledBrowser) and entry.active < self.contexts_per_browser
+                ]
+                if usable:
+                    entry = min(usable, key=lambda e: e.active)
+                    entry.active += 1
+                    entry.pages += 1
+                    return entry
+                if None in self._slots:
+                    index = self._slots.index(None)
+                    self._slots[index] = _LAUNCHING
+                    break
+                await self._available.wait()
+
+        # 브라우저 실행은 느리므로 Condition 밖에서 (그동안 다른 요청은 다른 브라우저를 씀)
+        try:
+            entry = await self._launch()
+        except Exception:
+            # 실행 실패 시 자리를 비워 다음 요청이 다시 시도하도록 함
+            async with self._available:
+                self._slots[index] = None
+                self._available.notify_all()
+            raise
+        async with self._available:
+            entry.active = 1
+            entry.pages = 1
+            self._slots[index] = entry
+            self._available.notify_all()
+        return entry
+
+    async def _release(self, entry):
+        """컨텍스트 하나를 반납하고, 자리를 넘긴 브라우저는 마지막 컨텍스트가 끝나면 닫음"""
+        async with self._available:
+            entry.active -= 1
+            drained = entry in self._retired and entry.active == 0
+            if drained:
+                self._retired.discard(entry)
+            self._available.notify_all()
+        if drained:
+            await self._close_browser(entry)
+
+    @asynccontextmanager
+    async def _page(self):
+        entry = await self._acquire()
+        context = None
+        try:
+            # 요청마다 쿠키/캐시가 분리된 컨텍스트 사용
+            context = await entry.browser.new_context()
+            if self.block_resources:
+                await context.route("**/*", _block_resources)
+            yield await context.new_page()
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await self._release(entry)
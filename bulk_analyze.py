@@ -0,0 +1,249 @@
+# 대량 리뷰 오프라인 감정 분석 CLI (CSV / JSONL / Parquet → JSONL / CSV)
+#
+# 예) python bulk_analyze.py reviews.csv results.jsonl --text-column review --workers 4
+#     중간에 멈춰도 같은 명령을 다시 실행하면 체크포인트부터 이어서 처리합니다.
+
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import sentiment
+from inference_pool import _init_worker
+
+# 기본 설정 (환경 변수로 변경 가능)
+CHUNK_SIZE = int(os.environ.get("BULK_CHUNK_SIZE", "1000"))
+WORKERS = int(os.environ.get("BULK_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+
+csv.field_size_limit(sys.maxsize)
+
+
+# 1️⃣ 입력 파일을 청크 단위로 읽기 (파일 전체를 메모리에 올리지 않음)
+def _iter_csv(path, columns):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            yield [row.get(column) for column in columns]
+
+
+def _iter_jsonl(path, columns):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                yield [row.get(column) for column in columns]
+
+
+def _iter_parquet(path, columns, batch_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("❌ Parquet 파일을 읽으려면 `pip install pyarrow`가 필요합니다.")
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield from zip(*(batch.column(column).to_pylist() for column in columns))
+
+
+def iter_rows(path, columns, batch_size=CHUNK_SIZE):
+    """파일 확장자에 맞춰 한 행씩 [columns 값 목록]을 yield"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return _iter_csv(path, columns)
+    if extension in (".jsonl", ".ndjson"):
+        return _iter_jsonl(path, columns)
+    if extension == ".parquet":
+        return _iter_parquet(path, columns, batch_size)
+    raise SystemExit(f"❌ 지원하지 않는 입력 형식입니다: {extension} (csv, jsonl, parquet)")
+
+
+def iter_chunks(rows, chunk_size, skip=0):
+    """앞의 skip행을 건너뛰고 (시작 행 번호, 행 목록) 청크를 yield"""
+    chunk = []
+    start = skip
+    for index, row in enumerate(rows):
+        if index < skip:
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+# 2️⃣ 결과를 청크 단위로 이어 쓰기 + 체크포인트
+class ResultWriter:
+    """결과를 JSONL 또는 CSV로 이어 쓰고, 청크마다 체크포인트를 남기는 출력기
+
+    체크포인트에는 처리한 행 수와 그 시점의 출력 파일 크기를 기록합니다. 다시 실행하면
+    출력 파일을 체크포인트 크기로 잘라 (중간에 끊긴 쓰기 제거) 그다음 행부터 이어서 씁니다.
+    """
+
+    FIELDS = ["row", "id", "review", "sentiment", "score"]
+
+    def __init__(self, path, input_path, resume=True):
+        self.path = path
+        self.checkpoint_path = path + ".checkpoint"
+        self.input_path = os.path.abspath(input_path)
+        self.is_csv = path.lower().endswith(".csv")
+        self.rows_done = 0
+
+        checkpoint = self._load_checkpoint() if resume else None
+        if checkpoint is not None:
+            self.rows_done = checkpoint["rows_done"]
+            self._file = open(path, "r+b")
+            self._file.truncate(checkpoint["output_bytes"])
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(path, "wb")
+            if self.is_csv:
+                self._write_rows([self.FIELDS])
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get("input") != self.input_path:
+            print(f"⚠️ 체크포인트의 입력 파일이 다릅니다. 처음부터 다시 시작합니다: {checkpoint.get('input')}")
+            return None
+        # 체크포인트 이후 출력 파일이 지워졌거나 잘렸다면 이어 쓸 수 없음
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < checkpoint["output_bytes"]:
+            print("⚠️ 출력 파일이 체크포인트와 맞지 않습니다. 처음부터 다시 시작합니다.")
+            return None
+        return checkpoint
+
+    def _write_rows(self, rows):
+        if self.is_csv:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            self._file.write(buffer.getvalue().encode("utf-8"))
+        else:
+            for row in rows:
+                self._file.write((json.dumps(dict(zip(self.FIELDS, row)), ensure_ascii=False) + "\n").encode("utf-8"))
+
+    def write_chunk(self, start, ids, results):
+        """청크 결과를 쓰고 디스크에 반영한 뒤 체크포인트 갱신"""
+        self._write_rows([
+            [start + i, ids[i], result["review"], result["sentiment"], round(result["score"], 6)]
+            for i, result in enumerate(results)
+        ])
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.rows_done = start + len(results)
+
+        # 임시 파일에 쓰고 교체해 체크포인트가 깨지지 않도록 함
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "input": self.input_path,
+                "rows_done": self.rows_done,
+                "output_bytes": self._file.tell()
+            }, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def close(self):
+        self._file.close()
+
+
+# 3️⃣ 워커 프로세스에서 청크 분석
+def _analyze_chunk(texts):
+    return sentiment.analyze_sentiment_batch(texts)
+
+
+def _analyze_in_process(chunks):
+    sentiment.load_model()
+    for start, rows in chunks:
+        yield start, rows, _analyze_chunk([row[0] for row in rows])
+
+
+def _analyze_in_workers(chunks, workers, threads_per_worker):
+    """청크를 워커 프로세스에 나눠 보내고 입력 순서대로 결과를 yield
+
+    한 번에 워커 수의 2배까지만 청크를 보내 입력을 너무 앞서 읽지 않도록 합니다.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(threads_per_worker, context.Value("i", 0))
+    ) as executor:
+        in_flight = deque()
+        for start, rows in chunks:
+            in_flight.append((start, rows, executor.submit(_analyze_chunk, [row[0] for row in rows])))
+            if len(in_flight) >= workers * 2:
+                start, rows, future = in_flight.popleft()
+                yield start, rows, future.result()
+        while in_flight:
+            start, rows, future = in_flight.popleft()
+            yield start, rows, future.result()
+
+
+def run(input_path, output_path, text_column="review", id_column=None,
+        chunk_size=CHUNK_SIZE, workers=WORKERS, threads_per_worker=0, resume=True):
+    """입력 파일 전체를 감정 분석해 output_path에 기록하고 처리한 행 수 반환"""
+    writer = ResultWriter(output_path, input_path, resume=resume)
+    if writer.rows_done:
+        print(f"↩️ 체크포인트에서 이어서 처리합니다: {writer.rows_done}행 완료")
+
+    columns = [text_column] + ([id_column] if id_column else [])
+    chunks = iter_chunks(iter_rows(input_path, columns, chunk_size), chunk_size, skip=writer.rows_done)
+
+    if workers > 1:
+        threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        print(f"🧠 워커 {workers}개로 분석 (워커당 스레드 {threads_per_worker}개)")
+        analyzed = _analyze_in_workers(chunks, workers, threads_per_worker)
+    else:
+        analyzed = _analyze_in_process(chunks)
+
+    started = time.perf_counter()
+    processed = 0
+    try:
+        for start, rows, results in analyzed:
+            ids = [row[1] if id_column else None for row in rows]
+            writer.write_chunk(start, ids, results)
+            processed += len(rows)
+            elapsed = time.perf_counter() - started
+            print(f"📝 {writer.rows_done}행 완료 ({processed / elapsed:.1f}행/초)")
+    finally:
+        writer.close()
+
+    print(f"✅ 분석 완료: {writer.rows_done}행 → {output_path}")
+    return writer.rows_done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="리뷰 파일을 감정 분석해 결과를 파일로 저장합니다.")
+    parser.add_argument("input", help="입력 파일 (.csv, .jsonl, .parquet)")
+    parser.add_argument("output", help="출력 파일 (.jsonl 또는 .csv)")
+    parser.add_argument("--text-column", default="review", help="리뷰 텍스트 컬럼 이름 (기본: review)")
+    parser.add_argument("--id-column", help="결과에 함께 남길 ID 컬럼 이름")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"청크 크기 (기본: {CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"워커 프로세스 수 (기본: {WORKERS}, 1이면 현재 프로세스)")
+    parser.add_argument("--threads-per-worker", type=int, default=0, help="워커당 torch 스레드 수 (기본: 코어 수 / 워커 수)")
+    parser.add_argument("--no-resume", action="store_true", help="체크포인트를 무시하고 처음부터 다시 분석")
+    args = parser.parse_args(argv)
+
+    run(
+        args.input,
+        args.output,
+        text_column=args.text_column,
+        id_column=args.id_column,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        resume=not args.no_resume
+    )
+
+
+if __name__ == "__main__":
+    main()
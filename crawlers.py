@@ -0,0 +1,581 @@
+# 리뷰 수집 백엔드 (HTTP / Playwright / Selenium / 샘플) + 설정 기반 대체 체인
+#
+# 모든 백엔드는 stream(movie_title, max_reviews)로 새 리뷰 묶음(list)을 차례로 yield합니다.
+# 브라우저 라이브러리는 해당 백엔드를 실제로 쓸 때만 import하므로
+# Playwright만 / Selenium만 설치된 환경에서도 같은 앱을 실행할 수 있습니다.
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import quote
+
+from http_crawler import HTTP_TIMEOUT, MORE_BUTTON_SELECTOR, NAVER_SEARCH_URL, REVIEW_SELECTOR, fetch_review_page
+from metrics import CRAWL_BACKEND_RESULTS, CRAWL_FAILURES, CRAWL_HEDGES
+
+# 리뷰 요소가 나타날 때까지 기다리는 최대 시간 (초)
+REVIEW_WAIT_TIMEOUT = float(os.environ.get("REVIEW_WAIT_TIMEOUT", "10"))
+# 다음 리뷰 묶음이 로딩되기를 기다리는 최대 시간 (초)
+REVIEW_PAGE_TIMEOUT = float(os.environ.get("REVIEW_PAGE_TIMEOUT", "3"))
+# 한 번에 수집할 수 있는 최대 리뷰 수
+MAX_REVIEWS_LIMIT = int(os.environ.get("MAX_REVIEWS_LIMIT", "1000"))
+# 브라우저를 띄우기 전에 HTTP 요청만으로 리뷰를 가져올지 여부 (0이면 체인에서 http 제외)
+HTTP_FETCH_ENABLED = os.environ.get("HTTP_FETCH_ENABLED", "1") == "1"
+
+# 수집 순서: 쉼표로 구분한 순서대로 시도하고, "|"로 묶은 백엔드는 동시에 실행해 먼저 답한 쪽을 사용
+# 예) "http,playwright|selenium,sample"
+CRAWLER_CHAIN = os.environ.get("CRAWLER_CHAIN", "http,playwright,sample")
+# 백엔드별로 (첫) 리뷰 묶음을 기다리는 최대 시간 (초), CRAWLER_TIMEOUT_<이름>으로 변경 가능
+DEFAULT_TIMEOUTS = {
+    "http": HTTP_TIMEOUT + 1,
+    "playwright": REVIEW_WAIT_TIMEOUT + 10,
+    "selenium": REVIEW_WAIT_TIMEOUT + 20,
+    "sample": 1,
+}
+# 실제 크롤러가 모두 실패했거나 시간 예산이 끝났을 때만 쓰는 대체 백엔드
+FALLBACK_BACKENDS = {"sample"}
+
+# 요청별 시간 예산: 이 시간(초) 안에 첫 리뷰를 못 받으면 크롤링을 멈추고 캐시/샘플 데이터로 대체 (0이면 무제한)
+CRAWL_DEADLINE = float(os.environ.get("CRAWL_DEADLINE", "15"))
+# 첫 리뷰가 최근 응답 시간의 상위 백분위수보다 늦으면 다음 백엔드(없으면 같은 백엔드)로 한 번 더 시도
+CRAWL_HEDGE_ENABLED = os.environ.get("CRAWL_HEDGE_ENABLED", "1") == "1"
+CRAWL_HEDGE_PERCENTILE = float(os.environ.get("CRAWL_HEDGE_PERCENTILE", "95"))
+# 응답 시간 기록이 CRAWL_HEDGE_MIN_SAMPLES개 모이기 전에 쓰는 대기 시간 (초)
+CRAWL_HEDGE_DELAY = float(os.environ.get("CRAWL_HEDGE_DELAY", "3"))
+CRAWL_HEDGE_MIN_SAMPLES = int(os.environ.get("CRAWL_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_WINDOW = 200  # 백엔드별로 기억하는 최근 첫 리뷰 응답 시간 수
+
+
+class PartialCrawl(Exception):
+    """리뷰를 일부만 가져왔고 더 있어 다음 백엔드에 맡길 때 발생 (가져온 리뷰는 reviews에 보관)
+
+    CrawlerChain은 다음 백엔드를 시도하고, 그 백엔드들이 아무것도 못 가져오면 이 리뷰를 사용합니다.
+    """
+
+    def __init__(self, reviews):
+        super().__init__(f"리뷰 {len(reviews)}개만 수집 (더 있음)")
+        self.reviews = reviews
+
+
+# 1️⃣ HTTP (브라우저 없이 검색 결과 HTML만 받아 파싱)
+class HttpCrawler:
+    name = "http"
+
+    def start(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def stream(self, movie_title, max_reviews):
+        reviews, has_more = await fetch_review_page(movie_title, max_reviews)
+        # 검색 결과 첫 화면만 보므로 리뷰가 모자라고 "더보기"가 있으면 다음 백엔드(브라우저)에 맡김
+        if reviews and len(reviews) < max_reviews and has_more:
+            raise PartialCrawl(reviews)
+        if reviews:
+            yield reviews
+
+
+# 2️⃣ Playwright (브라우저 풀에서 페이지를 빌려 더보기로 넘기며 수집)
+async def _load_more_reviews(page, count):
+    """더보기 클릭 또는 스크롤로 다음 리뷰를 불러오고, 리뷰 수가 늘었으면 True"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    more_button = await page.query_selector(MORE_BUTTON_SELECTOR)
+    if more_button and await more_button.is_visible():
+        await more_button.click()
+    else:
+        await page.eval_on_selector_all(REVIEW_SELECTOR, "els => els[els.length - 1].scrollIntoView()")
+
+    try:
+        await page.wait_for_function(
+            "([selector, count]) => document.querySelectorAll(selector).length > count",
+            arg=[REVIEW_SELECTOR, count],
+            timeout=REVIEW_PAGE_TIMEOUT * 1000
+        )
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def _iter_review_pages(page, movie_title, max_reviews):
+    """풀에서 빌린 페이지로 리뷰 목록을 넘기며 새 리뷰 묶음을 yield"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    # 영화 리뷰 검색 URL
+    search_url = f"{NAVER_SEARCH_URL}?query=영화 {movie_title} 평점"
+    await page.goto(search_url, wait_until="domcontentloaded")
+
+    # 고정 대기 대신 리뷰 요소가 나타나는 즉시 진행
+    try:
+        await page.wait_for_selector(REVIEW_SELECTOR, timeout=REVIEW_WAIT_TIMEOUT * 1000)
+    except PlaywrightTimeoutError:
+        return
+
+    seen = set()
+    offset = 0  # 이미 읽은 리뷰 요소 수
+    remaining = max_reviews
+
+    while True:
+        # 새로 붙은 리뷰 요소의 텍스트만 한번에 읽어옴
+        texts = await page.eval_on_selector_all(
+            REVIEW_SELECTOR, "(els, offset) => els.slice(offset).map(e => e.innerText)", offset
+        )
+        offset += len(texts)
+
+        batch = []
+        for text in texts:
+            text = text.strip()
+            if text and text not in seen:
+                seen.add(text)
+                batch.append(text)
+        batch = batch[:remaining]
+
+        if batch:
+            remaining -= len(batch)
+            yield batch
+
+        if remaining <= 0 or not await _load_more_reviews(page, offset):
+            return
+
+
+class PlaywrightCrawler:
+    name = "playwright"
+
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            from browser_pool import BrowserPool
+            self._pool = BrowserPool()
+        return self._pool
+
+    def start(self):
+        self.pool.start()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+
+    async def stream(self, movie_title, max_reviews):
+        async for batch in self.pool.stream(_iter_review_pages, movie_title, max_reviews):
+            yield batch
+
+
+# 3️⃣ Selenium (드라이버 풀에서 드라이버를 빌려 스레드에서 수집)
+def _load_more_reviews_selenium(driver, count):
+    """더보기 클릭 또는 스크롤로 다음 리뷰를 불러오고, 리뷰 수가 늘었으면 True"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    more_buttons = [b for b in driver.find_elements(By.CSS_SELECTOR, MORE_BUTTON_SELECTOR) if b.is_displayed()]
+    if more_buttons:
+        more_buttons[0].click()
+    else:
+        review_elements = driver.find_elements(By.CSS_SELECTOR, REVIEW_SELECTOR)
+        driver.execute_script("arguments[0].scrollIntoView();", review_elements[-1])
+
+    try:
+        WebDriverWait(driver, REVIEW_PAGE_TIMEOUT).until(
+            lambda d: len(d.find_elements(By.CSS_SELECTOR, REVIEW_SELECTOR)) > count
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def _iter_review_pages_selenium(driver, movie_title, max_reviews):
+    """풀에서 빌린 드라이버로 검색 결과를 열고 리뷰 목록을 넘기며 새 리뷰 묶음을 yield"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # 네이버 영화 검색 URL
+    search_url = f"{NAVER_SEARCH_URL}?where=nexearch&sm=tab_etc&mra=bkEw&pkid=68&os=36885745&qvt=0&query=영화 {quote(movie_title)} 평점"
+    driver.get(search_url)
+
+    search_buttons = driver.find_elements(By.CSS_SELECTOR, "button.bt_search")
+    if search_buttons:
+        search_buttons[0].click()  # 첫 번째 버튼 클릭
+
+    # 고정 대기 대신 리뷰 요소가 나타나는 즉시 진행
+    try:
+        WebDriverWait(driver, REVIEW_WAIT_TIMEOUT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, REVIEW_SELECTOR))
+        )
+    except TimeoutException:
+        return
+
+    # 더보기/스크롤로 리뷰 목록을 넘기며 max_reviews개까지 중복 없이 수집
+    seen = set()
+    offset = 0  # 이미 읽은 리뷰 요소 수
+    remaining = max_reviews
+    while True:
+        review_elements = driver.find_elements(By.CSS_SELECTOR, REVIEW_SELECTOR)
+        batch = []
+        for elem in review_elements[offset:]:
+            text = elem.text.strip()
+            if text and text not in seen:
+                seen.add(text)
+                batch.append(text)
+        offset = len(review_elements)
+        batch = batch[:remaining]
+
+        if batch:
+            remaining -= len(batch)
+            yield batch
+
+        if remaining <= 0 or not _load_more_reviews_selenium(driver, offset):
+            return
+
+
+class SeleniumCrawler:
+    name = "selenium"
+
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            from driver_pool import DriverPool
+            self._pool = DriverPool()
+        return self._pool
+
+    def start(self):
+        self.pool.start()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+
+    async def stream(self, movie_title, max_reviews):
+        """Selenium은 동기 API이므로 스레드에서 페이지를 넘기며 묶음마다 이 루프의 큐로 전달
+
+        소비자가 멈추거나 취소되면 스레드는 다음 페이지로 넘어가기 전에 멈추고 드라이버를 반납합니다.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def put(kind, value=None):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+            except RuntimeError:
+                pass  # 이벤트 루프가 이미 닫힘
+
+        def crawl():
+            try:
+                with self.pool.lease() as driver:
+                    for batch in _iter_review_pages_selenium(driver, movie_title, max_reviews):
+                        put("batch", batch)
+                        if cancelled.is_set():
+                            break
+            except Exception as e:
+                put("error", e)
+                return
+            put("done")
+
+        threading.Thread(target=crawl, name="selenium-crawl", daemon=True).start()
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise value
+                yield value
+        finally:
+            cancelled.set()
+
+
+# 4️⃣ 샘플 리뷰 데이터 (크롤링 실패 시 사용)
+sample_reviews = {
+    "기생충": [
+        "정말 충격적이고 인상 깊은 영화였어요. 봉준호 감독의 연출력이 돋보입니다.",
+        "사회 계층 간의 갈등을 너무나 현실적으로 그려낸 작품이네요.",
+        "예상치 못한 반전과 긴장감이 계속 이어져서 몰입도가 높았습니다.",
+        "배우들의 연기력이 정말 뛰어나고 스토리텔링도 완벽해요.",
+        "좀 과장된 면이 있긴 하지만 전체적으로는 만족스러운 영화입니다."
+    ],
+    "타이타닉": [
+        "로맨틱한 사랑 이야기와 웅장한 스케일이 인상적이었어요.",
+        "레오나르도 디카프리오와 케이트 윈슬렛의 케미가 정말 좋았습니다.",
+        "너무 길고 뻔한 스토리라 조금 지루했어요.",
+        "특수효과와 음악이 정말 대단하고 감동적이었습니다.",
+        "클래식한 멜로 영화의 대표작이라고 할 수 있겠네요."
+    ]
+}
+
+def get_sample_reviews(movie_title, max_reviews=10):
+    """샘플 리뷰 반환 (크롤링 실패 시 대체용)"""
+    for key in sample_reviews.keys():
+        if key in movie_title or movie_title in key:
+            return sample_reviews[key][:max_reviews], f"✅ 샘플 데이터 {len(sample_reviews[key][:max_reviews])}개를 사용합니다."
+
+    # 기본 샘플 리뷰
+    default_reviews = [
+        "정말 재미있는 영화였어요. 추천합니다!",
+        "스토리는 괜찮았는데 연출이 아쉬웠어요.",
+        "배우들의 연기가 인상적이었습니다.",
+        "예상보다 지루했지만 나쁘지 않았어요.",
+        "볼만한 영화입니다. 시간 가는 줄 몰랐어요."
+    ]
+    return default_reviews, "✅ 기본 샘플 데이터를 사용합니다."
+
+
+class SampleCrawler:
+    name = "sample"
+
+    def start(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def stream(self, movie_title, max_reviews):
+        reviews, _ = get_sample_reviews(movie_title, max_reviews)
+        if reviews:
+            yield reviews
+
+
+# 5️⃣ 대체 체인
+BACKENDS = {
+    "http": HttpCrawler,
+    "playwright": PlaywrightCrawler,
+    "selenium": SeleniumCrawler,
+    "sample": SampleCrawler,
+}
+
+
+def parse_chain(spec, known=BACKENDS):
+    """"http,playwright|selenium,sample" → [["http"], ["playwright", "selenium"], ["sample"]]"""
+    stages = []
+    for part in spec.split(","):
+        names = []
+        for name in part.split("|"):
+            name = name.strip().lower()
+            if not name:
+                continue
+            if name not in known:
+                print(f"⚠️ 알 수 없는 크롤러 백엔드는 건너뜁니다: {name}")
+                continue
+            if name == "http" and not HTTP_FETCH_ENABLED:
+                continue
+            names.append(name)
+        if names:
+            stages.append(names)
+    return stages
+
+
+async def _exhausted():
+    """더 내놓을 리뷰가 없는 스트림"""
+    return
+    yield
+
+
+def _percentile(values, p):
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class CrawlerChain:
+    """설정한 순서대로 백엔드를 시도하며 리뷰를 수집하는 체인
+
+    각 백엔드는 첫 리뷰 묶음을 timeouts[이름]초 안에 내놓지 못하거나 실패하면 건너뛰고
+    다음 단계로 넘어갑니다. 한 단계에 여러 백엔드가 있으면 동시에 실행해 먼저 리뷰를
+    내놓은 백엔드만 남기고 나머지는 취소합니다. 첫 묶음 이후에는 그 백엔드로만 계속 수집합니다.
+
+    첫 리뷰가 그 백엔드의 최근 응답 시간 백분위수(hedge_percentile)보다 늦으면 다음 단계를
+    (없으면 같은 백엔드를 새 컨텍스트로) 한 번 더 동시에 시작해 먼저 답한 쪽을 씁니다.
+    deadline초 안에 첫 리뷰를 못 받으면 진행 중인 크롤링을 모두 취소하고, 샘플 같은 대체
+    백엔드(FALLBACK_BACKENDS)는 그 뒤에만 시도합니다.
+
+    리뷰를 일부만 가져온 백엔드(PartialCrawl)는 다음 단계에 맡기되, 이후 백엔드가 아무것도
+    못 가져오면 그 일부 리뷰를 결과로 씁니다.
+    """
+
+    def __init__(self, spec=CRAWLER_CHAIN, timeouts=None, backends=None, deadline=CRAWL_DEADLINE,
+                 hedge=CRAWL_HEDGE_ENABLED, hedge_percentile=CRAWL_HEDGE_PERCENTILE):
+        stages = parse_chain(spec, backends or BACKENDS)
+        names = [name for stage in stages for name in stage]
+        # 대체 백엔드만 있는 단계는 실제 크롤러 뒤로 분리
+        self.stages = [stage for stage in stages if not set(stage) <= FALLBACK_BACKENDS]
+        self.fallback_stages = [stage for stage in stages if set(stage) <= FALLBACK_BACKENDS]
+        self.backends = backends or {name: BACKENDS[name]() for name in names}
+        self.timeouts = {
+            name: float(os.environ.get(f"CRAWLER_TIMEOUT_{name.upper()}", DEFAULT_TIMEOUTS.get(name, REVIEW_WAIT_TIMEOUT)))
+            for name in names
+        }
+        self.timeouts.update(timeouts or {})
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self._latencies = {name: deque(maxlen=HEDGE_WINDOW) for name in names}
+
+    def start(self):
+        """브라우저 풀 등 백엔드 자원을 미리 준비 (실패한 백엔드는 요청 때 다시 시도)"""
+        for name, backend in self.backends.items():
+            try:
+                backend.start()
+            except Exception as e:
+                print(f"⚠️ {name} 크롤러 준비 실패: {e}")
+
+    def close(self):
+        for name, backend in self.backends.items():
+            try:
+                backend.close()
+            except Exception as e:
+                print(f"⚠️ {name} 크롤러 종료 실패: {e}")
+
+    def hedge_delay(self, name):
+        """name 백엔드의 첫 리뷰를 이만큼(초) 기다려도 없으면 추가 시도를 시작"""
+        latencies = self._latencies.get(name)
+        if not latencies or len(latencies) < CRAWL_HEDGE_MIN_SAMPLES:
+            return CRAWL_HEDGE_DELAY
+        return _percentile(latencies, self.hedge_percentile)
+
+    async def stream(self, movie_title, max_reviews=10, fallback=True):
+        """리뷰를 묶음 단위로 수집하며 (백엔드 이름, 새 리뷰 묶음, 시작 후 경과 시간)을 yield
+
+        fallback=False면 실제 크롤러만 시도합니다 (대체 백엔드는 fallback()으로 따로 실행).
+        """
+        started = time.perf_counter()
+        deadline = started + self.deadline if self.deadline > 0 else None
+        received = False
+        async for item in self._stream(self.stages, movie_title, max_reviews, started, deadline, self.hedge):
+            received = True
+            yield item
+        if fallback and not received:
+            async for item in self._stream(self.fallback_stages, movie_title, max_reviews, started):
+                yield item
+
+    async def fallback(self, movie_title, max_reviews=10):
+        """대체 백엔드(샘플 데이터 등)로만 수집"""
+        async for item in self._stream(self.fallback_stages, movie_title, max_reviews, time.perf_counter()):
+            yield item
+
+    async def _stream(self, stages, movie_title, max_reviews, started, deadline=None, hedge=False):
+        max_reviews = min(int(max_reviews), MAX_REVIEWS_LIMIT)
+        winner = await self._first_batch(stages, movie_title, max_reviews, deadline, hedge)
+        if winner is None:
+            return
+
+        name, batch, stream = winner
+        CRAWL_BACKEND_RESULTS.labels(name).inc()
+        try:
+            remaining = max_reviews - len(batch)
+            yield name, batch, time.perf_counter() - started
+            while remaining > 0:
+                try:
+                    batch = await asyncio.wait_for(anext(stream), self.timeouts[name])
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    # 이미 받은 리뷰는 살리고 여기서 멈춤
+                    CRAWL_FAILURES.labels(name, "stalled").inc()
+                    break
+                except Exception as e:
+                    print(f"{name} 크롤링 중단: {e}")
+                    CRAWL_FAILURES.labels(name, "error").inc()
+                    break
+                remaining -= len(batch)
+                yield name, batch, time.perf_counter() - started
+        finally:
+            await stream.aclose()
+
+    async def _first_batch(self, stages, movie_title, max_reviews, deadline=None, hedge=False):
+        """단계별로 백엔드를 실행해 가장 먼저 나온 (이름, 첫 묶음, 스트림) 반환, 모두 실패하면 None
+
+        같은 단계의 백엔드는 동시에 시작하고, 단계가 모두 실패하면 다음 단계를 시작합니다.
+        hedge면 첫 리뷰가 늦을 때 다음 단계를 한 번 앞당겨 시작합니다 (다음 단계가 없으면 같은 단계 재시도).
+        """
+        waiting = deque(stages)
+        attempts = {}  # task → (백엔드 이름, 스트림, 시작 시각)
+        hedge_at = None
+        winner = None
+        partial = None  # 일부만 가져온 백엔드의 (이름, 리뷰) (다른 백엔드가 모두 실패하면 사용)
+
+        def launch(stage):
+            """stage의 백엔드를 시작하고, 추가 시도를 시작할 시각 반환"""
+            now = time.perf_counter()
+            for name in stage:
+                stream = self.backends[name].stream(movie_title, max_reviews)
+                task = asyncio.ensure_future(asyncio.wait_for(anext(stream), self.timeouts[name]))
+                attempts[task] = (name, stream, now)
+            return now + min(self.hedge_delay(name) for name in stage)
+
+        try:
+            if waiting:
+                hedge_at = launch(waiting.popleft())
+                if not hedge:
+                    hedge_at = None
+            running = set(attempts)
+            while running and winner is None:
+                now = time.perf_counter()
+                timeouts = [t - now for t in (deadline, hedge_at) if t is not None]
+                timeout = max(0, min(timeouts)) if timeouts else None
+                done, running = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    name, stream, launched = attempts[task]
+                    try:
+                        batch = task.result()
+                    except StopAsyncIteration:
+                        CRAWL_FAILURES.labels(name, "empty").inc()
+                    except asyncio.TimeoutError:
+                        print(f"{name} 크롤러 시간 초과 ({self.timeouts[name]:g}초)")
+                        CRAWL_FAILURES.labels(name, "timeout").inc()
+                    except PartialCrawl as e:
+                        print(f"{name}: {e}, 다음 백엔드로 이어서 수집합니다.")
+                        CRAWL_FAILURES.labels(name, "partial").inc()
+                        if partial is None or len(e.reviews) > len(partial[1]):
+                            partial = (name, e.reviews)
+                    except Exception as e:
+                        print(f"{name} 크롤링 실패: {e}")
+                        CRAWL_FAILURES.labels(name, "error").inc()
+                    else:
+                        if winner is None:
+                            winner = (name, batch, stream)
+                            self._latencies[name].append(time.perf_counter() - launched)
+                if winner is not None:
+                    break
+
+                now = time.perf_counter()
+                if deadline is not None and now >= deadline:
+                    print(f"⏱️ 크롤링 시간 예산({self.deadline:g}초)을 넘겨 중단합니다.")
+                    for task in running:
+                        CRAWL_FAILURES.labels(attempts[task][0], "deadline").inc()
+                    break
+                if not running and waiting:
+                    # 단계 전체가 실패하면 바로 다음 단계로 (추가 시도를 아직 안 썼으면 대기 시간도 다시 계산)
+                    next_hedge_at = launch(waiting.popleft())
+                    if hedge_at is not None:
+                        hedge_at = next_hedge_at
+                elif hedge_at is not None and now >= hedge_at:
+                    # 첫 리뷰가 늦으면 다음 단계(없으면 같은 백엔드)를 한 번 더 시작 (요청당 한 번)
+                    stage = waiting.popleft() if waiting else sorted({attempts[task][0] for task in running})
+                    for name in stage:
+                        CRAWL_HEDGES.labels(name).inc()
+                    hedge_at = None
+                    launch(stage)
+                running = {task for task in attempts if not task.done()}
+        finally:
+            # 진 백엔드는 취소하고, 취소가 끝난 뒤 스트림을 닫아 브라우저/드라이버를 반납
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+            for task, (name, stream, _) in attempts.items():
+                if winner is None or stream is not winner[2]:
+                    await stream.aclose()
+        if winner is None and partial is not None:
+            name, reviews = partial
+            winner = (name, reviews, _exhausted())
+        return winner
@@ -0,0 +1,178 @@
+# Selenium 헤드리스 Chrome 드라이버 풀 (앱 시작 시 한번 띄워 요청마다 빌려줌)
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# 풀 설정 (환경 변수로 변경 가능)
+POOL_SIZE = int(os.environ.get("SELENIUM_POOL_SIZE", "2"))
+MAX_PAGES_PER_DRIVER = int(os.environ.get("SELENIUM_MAX_PAGES", "100"))
+# 드라이버가 모두 사용 중일 때 기다리는 최대 시간 (초)
+LEASE_TIMEOUT = float(os.environ.get("SELENIUM_LEASE_TIMEOUT", "30"))
+CHROME_ARGS = [
+    "--headless=new",            # 브라우저 창 없이 실행
+    "--no-sandbox",              # Spaces/컨테이너에서 필수 옵션
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+]
+
+# 리뷰 텍스트와 무관한 광고·통계 요청 차단 (CDP Network.setBlockedURLs)
+BLOCKED_URLS = [
+    "*adcr.naver.com*", "*siape.veta.naver.com*", "*lcs.naver.com*", "*nlog.naver.com*",
+    "*tivan.naver.com*", "*wcs.naver.net*", "*doubleclick.net*", "*google-analytics.com*",
+    "*googletagmanager.com*", "*googlesyndication.com*",
+    "*.woff", "*.woff2", "*.ttf", "*.mp4", "*.webm",
+]
+
+
+class _PooledDriver:
+    """풀에 들어있는 드라이버와 지금까지 처리한 페이지 수"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """헤드리스 Chrome 드라이버를 미리 띄워두고 요청마다 하나씩 빌려주는 풀
+
+    lease()로 빌린 드라이버는 with 블록이 끝나면 예외가 나도 반드시 풀로 돌아갑니다.
+    블록에서 예외가 났거나, 응답이 없거나, max_pages번 쓴 드라이버는 quit()하고
+    새로 띄워 Chrome 프로세스가 쌓이지 않도록 합니다.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_DRIVER, lease_timeout=LEASE_TIMEOUT):
+        self.size = size
+        self.max_pages = max_pages
+        self.lease_timeout = lease_timeout
+        # None 자리는 다음에 빌려갈 때 새 드라이버를 띄움 (생성 실패 시에도 풀 크기 유지)
+        self._idle = queue.Queue()
+        self._executor = None
+        self._driver_path = None
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(None)
+
+    def start(self):
+        """드라이버를 미리 띄워둠 (여러 번 호출해도 한번만 실행)"""
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="selenium")
+
+        # 드라이버 생성은 느리므로 동시에 띄움
+        slots = [self._idle.get() for _ in range(self.size)]
+        futures = [self._executor.submit(self._ensure_driver, slot) for slot in slots]
+        ready = 0
+        for future in futures:
+            try:
+                self._idle.put(future.result())
+                ready += 1
+            except Exception as e:
+                print(f"⚠️ Chrome 드라이버 시작 실패: {e}")
+                self._idle.put(None)
+        print(f"🌐 Selenium 드라이버 풀 준비 완료 (드라이버 {ready}/{self.size}개)")
+
+    def close(self):
+        """모든 드라이버 종료 (사용 중인 드라이버는 반납될 때 종료됨)"""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(entry)
+
+    @contextmanager
+    def lease(self):
+        """풀에서 드라이버를 빌려 with 블록에 넘겨주고, 끝나면 반납 (문제 있던 드라이버는 교체)"""
+        try:
+            entry = self._idle.get(timeout=self.lease_timeout)
+        except queue.Empty:
+            raise RuntimeError(f"{self.lease_timeout:.0f}초 안에 사용 가능한 Chrome 드라이버가 없습니다.")
+
+        healthy = False
+        try:
+            entry = self._ensure_driver(entry)
+            yield entry.driver
+            healthy = True
+        finally:
+            self._release(entry, healthy)
+
+    def _release(self, entry, healthy):
+        if entry is None:
+            self._idle.put(None)
+            return
+        entry.pages += 1
+        if self._closed or not healthy or entry.pages >= self.max_pages:
+            self._quit(entry)
+            entry = None
+        else:
+            self._reset(entry)
+        self._idle.put(entry)
+
+    def _ensure_driver(self, entry):
+        """살아있는 드라이버면 그대로, 없거나 응답이 없으면 새로 띄워 반환"""
+        if entry is not None:
+            try:
+                entry.driver.current_url  # 세션이 살아있는지 확인
+                return entry
+            except Exception:
+                self._quit(entry)
+        return _PooledDriver(self._create_driver())
+
+    def _create_driver(self):
+        # 셀레니움은 브라우저가 필요할 때만 import (앱 시작 속도)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        for arg in CHROME_ARGS:
+            options.add_argument(arg)
+        # 이미지는 받지 않음
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+        driver = webdriver.Chrome(service=self._chrome_service(), options=options)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        return driver
+
+    def _chrome_service(self):
+        """chromedriver 경로는 한번만 찾음 (요청마다 ChromeDriverManager를 돌리지 않음)"""
+        from selenium.webdriver.chrome.service import Service
+
+        with self._lock:
+            if self._driver_path is None:
+                try:
+                    from webdriver_manager.chrome import ChromeDriverManager
+                    self._driver_path = ChromeDriverManager().install()
+                except Exception as e:
+                    # Selenium Manager가 드라이버를 찾도록 맡김
+                    print(f"ChromeDriverManager 사용 불가, Selenium 기본 드라이버 사용: {e}")
+                    self._driver_path = ""
+            path = self._driver_path
+        return Service(path) if path else Service()
+
+    def _reset(self, entry):
+        """다음 요청이 이전 요청의 쿠키/페이지를 보지 않도록 정리"""
+        try:
+            entry.driver.delete_all_cookies()
+            entry.driver.get("about:blank")
+        except Exception:
+            pass
+
+    def _quit(self, entry):
+        if entry is None:
+            return
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
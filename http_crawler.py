@@ -0,0 +1,98 @@
+# 브라우저 없이 HTTP로 네이버 검색 결과의 리뷰를 가져오는 경량 크롤러
+
+import asyncio
+import os
+
+import httpx
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401 (설치되어 있으면 더 빠른 파서 사용)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# 검색 URL (벤치마크 등에서 로컬 서버로 바꿀 수 있음)
+NAVER_SEARCH_URL = os.environ.get("NAVER_SEARCH_URL", "https://search.naver.com/search.naver")
+REVIEW_SELECTOR = ".area_review_content .desc._text"
+# 리뷰 목록 아래 "더보기" 버튼 (있으면 첫 화면 말고도 리뷰가 더 있음)
+MORE_BUTTON_SELECTOR = ".area_review_list ~ .api_more_wrap a, a.api_more"
+
+# HTTP 설정 (환경 변수로 변경 가능)
+HTTP_TIMEOUT = float(os.environ.get("HTTP_CRAWL_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "20"))
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+}
+
+# 이벤트 루프별로 하나씩 재사용하는 클라이언트 (연결 풀/keep-alive 공유)
+_clients = {}
+
+
+def get_client():
+    """현재 이벤트 루프에서 공유하는 httpx.AsyncClient 반환"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS
+            )
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_client():
+    """현재 이벤트 루프의 클라이언트 종료"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def parse_review_page(html, max_reviews=10):
+    """검색 결과 HTML에서 리뷰 텍스트를 중복 없이 최대 max_reviews개 추출해 (리뷰 목록, 더보기 여부) 반환"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    reviews = []
+    seen = set()
+
+    for elem in soup.select(REVIEW_SELECTOR):
+        # 브라우저의 innerText와 같은 텍스트가 되도록 <br>은 줄바꿈으로, 태그 사이 공백은 그대로 둠
+        # (백엔드마다 텍스트가 다르면 review_hash가 달라져 같은 리뷰를 새 리뷰로 저장함)
+        for br in elem.find_all("br"):
+            br.replace_with("\n")
+        text = elem.get_text().strip()
+        if text and text not in seen:
+            seen.add(text)
+            reviews.append(text)
+            if len(reviews) >= max_reviews:
+                break
+
+    return reviews, soup.select_one(MORE_BUTTON_SELECTOR) is not None
+
+
+async def fetch_review_page(movie_title, max_reviews=10, url=NAVER_SEARCH_URL):
+    """네이버 검색 결과 HTML을 직접 받아 (리뷰 목록, 더보기 여부) 반환 (실패하면 ([], False))"""
+    try:
+        response = await get_client().get(url, params={"query": f"영화 {movie_title} 평점"})
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"HTTP 크롤링 실패: {e}")
+        return [], False
+
+    # 파싱은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    return await asyncio.to_thread(parse_review_page, response.text, max_reviews)
+
+
+async def fetch_naver_movie_reviews(movie_title, max_reviews=10, url=NAVER_SEARCH_URL):
+    """네이버 검색 결과 HTML을 직접 받아 리뷰 목록 반환 (실패하면 빈 목록)"""
+    reviews, _ = await fetch_review_page(movie_title, max_reviews, url)
+    return reviews
@@ -0,0 +1,192 @@
+# 감정 분석 전용 워커 프로세스 풀 + 동시 요청을 묶어 보내는 동적 배처
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import sentiment
+
+# 풀 설정 (환경 변수로 변경 가능, 워커 0개면 풀을 쓰지 않음)
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", "0"))
+# 워커당 torch 스레드 수 (기본: CPU 코어를 워커 수로 나눈 값)
+THREADS_PER_WORKER = int(os.environ.get("INFERENCE_THREADS_PER_WORKER", "0"))
+# 여러 요청의 리뷰를 모으는 최대 대기 시간 (초)과 한 번에 워커로 보내는 최대 리뷰 수
+COALESCE_WINDOW = float(os.environ.get("INFERENCE_COALESCE_WINDOW", "0.02"))
+COALESCE_MAX_BATCH = int(os.environ.get("INFERENCE_COALESCE_MAX_BATCH", "64"))
+
+
+def _init_worker(num_threads, worker_counter):
+    """워커 프로세스 초기화: CPU 코어 고정, torch 스레드 수 제한 후 모델 로딩"""
+    # torch import 전에 설정해야 OpenMP/MKL 스레드 풀 크기에 반영됨
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["MKL_NUM_THREADS"] = str(num_threads)
+
+    with worker_counter.get_lock():
+        index = worker_counter.value
+        worker_counter.value += 1
+
+    # 워커마다 서로 다른 코어 묶음에 고정해 스레드끼리 코어를 빼앗지 않도록 함 (리눅스)
+    if hasattr(os, "sched_setaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+        own_cores = cores[index * num_threads:(index + 1) * num_threads]
+        if own_cores:
+            os.sched_setaffinity(0, own_cores)
+
+    import torch
+
+    torch.set_num_threads(num_threads)
+    torch.set_num_interop_threads(1)
+    sentiment.load_model()
+
+
+def _predict_in_worker(texts):
+    return sentiment._predict_texts(texts, sentiment.BATCH_SIZE)
+
+
+def _observe_batches(count):
+    """워커가 count개를 BATCH_SIZE 단위로 나눠 추론하는 배치 크기를 앱 프로세스에서 기록
+
+    워커 프로세스에서 기록한 지표는 /metrics에 나오지 않으므로 _predict_texts와
+    같은 방식으로 나눈 크기를 여기서 대신 기록합니다.
+    """
+    if sentiment.on_batch is None:
+        return
+    for start in range(0, count, sentiment.BATCH_SIZE):
+        sentiment.on_batch(min(sentiment.BATCH_SIZE, count - start))
+
+
+def _worker_model():
+    """워커가 실제로 로딩한 (메모 키, 추론 백엔드, 로딩 시간) 반환 (대안 모델/백엔드로 바뀌었을 수 있음)"""
+    return sentiment.sentiment_memo.model_key, sentiment.backend, sentiment.load_seconds
+
+
+class InferencePool:
+    """감정 분석 추론을 워커 프로세스에서 실행하고, 동시에 들어온 요청을 묶어 보내는 풀
+
+    predict()로 들어온 텍스트는 COALESCE_WINDOW 동안 모았다가 COALESCE_MAX_BATCH
+    단위로 나눠 워커에 보냅니다. 여러 사용자의 작은 요청이 하나의 배치로 합쳐지고,
+    큰 요청은 여러 워커에 나뉘어 동시에 처리됩니다. 이벤트 루프 하나에서만 사용합니다.
+    """
+
+    def __init__(self, workers=INFERENCE_WORKERS, threads_per_worker=THREADS_PER_WORKER,
+                 window=COALESCE_WINDOW, max_batch=COALESCE_MAX_BATCH):
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        self.window = window
+        self.max_batch = max_batch
+        self.ready = False
+        self._executor = None
+        self._pending = []  # (텍스트 목록, Future)
+        self._pending_count = 0
+        self._flush_handle = None
+        self._tasks = set()  # 진행 중인 _resolve 태스크 (끝나기 전에 GC되지 않도록 참조 유지)
+
+    def start(self):
+        """워커 프로세스를 띄우고 백그라운드에서 모델 로딩 시작"""
+        if self._executor is not None:
+            return
+        # torch는 fork 후 스레드 풀이 꼬일 수 있으므로 spawn 사용
+        context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, context.Value("i", 0))
+        )
+        # 작업을 넣어야 워커가 뜨고 초기화(모델 로딩)가 시작됨
+        for _ in range(self.workers):
+            self._executor.submit(_worker_model).add_done_callback(self._mark_ready)
+        print(f"🧠 추론 워커 {self.workers}개 시작 (워커당 스레드 {self.threads_per_worker}개)")
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _restart(self):
+        """워커가 죽어 망가진 풀(BrokenProcessPool)을 버리고 새 워커를 띄움 (모델 로딩이 끝날 때까지 준비 전)"""
+        print("⚠️ 추론 워커가 비정상 종료되어 워커 풀을 다시 시작합니다.")
+        self.ready = False
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.start()
+
+    def _mark_ready(self, future):
+        """워커가 알려준 모델 정보로 이 프로세스의 메모 키와 지표를 맞춘 뒤 준비 완료로 표시"""
+        if future.exception() is not None:
+            return
+        model_key, backend, load_seconds = future.result()
+        sentiment.sentiment_memo.set_model_key(model_key)
+        sentiment.backend = backend
+        sentiment.load_seconds = load_seconds
+        self.ready = True
+
+    async def predict(self, texts):
+        """texts를 다른 요청과 묶어 워커에서 추론하고 같은 순서의 (레이블, 점수, 확률)/None 목록 반환"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_count += len(texts)
+
+        if self._pending_count >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """모아둔 요청을 하나로 합쳐 max_batch 단위로 워커에 보냄"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending, self._pending_count = self._pending, [], 0
+
+        texts = [text for request_texts, _ in pending for text in request_texts]
+        executor = self._executor
+        jobs = []
+        try:
+            for start in range(0, len(texts), self.max_batch):
+                job_texts = texts[start:start + self.max_batch]
+                jobs.append(asyncio.wrap_future(executor.submit(_predict_in_worker, job_texts)))
+                _observe_batches(len(job_texts))
+        except Exception as e:
+            # 루프 콜백에서 실행되므로 여기서 예외를 알리지 않으면 기다리는 요청이 영원히 멈춤
+            for job in jobs:
+                job.cancel()
+            self._fail(pending, e, executor)
+            return
+
+        task = asyncio.ensure_future(self._resolve(pending, jobs, executor))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _fail(self, pending, error, executor):
+        """모아둔 요청 모두에 예외를 전달하고, 워커가 죽은 경우 풀을 다시 시작
+
+        이미 다른 요청이 새 풀로 바꿨다면 (executor가 현재 풀이 아니면) 다시 시작하지 않습니다.
+        """
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+        if isinstance(error, BrokenProcessPool) and executor is self._executor:
+            self._restart()
+
+    async def _resolve(self, pending, jobs, executor):
+        """워커 결과를 요청별로 다시 나눠 각 Future에 전달"""
+        try:
+            predictions = [prediction for chunk in await asyncio.gather(*jobs) for prediction in chunk]
+        except Exception as e:
+            self._fail(pending, e, executor)
+            return
+
+        start = 0
+        for request_texts, future in pending:
+            end = start + len(request_texts)
+            if not future.done():
+                future.set_result(predictions[start:end])
+            start = end
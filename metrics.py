@@ -0,0 +1,153 @@
+# 앱 동작 지표 (Prometheus /metrics) + 요청별 구조화 트레이스 로그
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import REGISTRY, CounterMetricFamily, GaugeMetricFamily, InfoMetricFamily
+
+import sentiment
+
+# 요청별 트레이스 로그 경로 (비어 있으면 기록하지 않음, "-"면 표준 출력)
+TRACE_LOG_PATH = os.environ.get("TRACE_LOG_PATH", "")
+
+# 1️⃣ 지표 정의
+# 단계: crawl(리뷰 수집 전체), first_review(첫 리뷰까지), sentiment(감정 분석 1회), chart, table, summary
+STAGE_SECONDS = Histogram(
+    "movie_review_stage_seconds", "분석 단계별 소요 시간 (초)", ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+REQUEST_SECONDS = Histogram(
+    "movie_review_request_seconds", "영화 한 편 분석 전체 소요 시간 (초)", ["source"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+SENTIMENT_BATCH_SIZE = Histogram(
+    "sentiment_batch_size", "모델에 한번에 넣은 배치 크기 (메모 적중·요청 묶기 이후 실제 추론한 리뷰 수)",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+)
+sentiment.on_batch = SENTIMENT_BATCH_SIZE.observe
+CRAWL_FAILURES = Counter(
+    "crawl_failures_total", "리뷰 수집 실패 횟수 (empty / timeout / stalled / deadline / partial / error)", ["source", "reason"]
+)
+CRAWL_HEDGES = Counter(
+    "crawl_hedges_total", "첫 리뷰가 늦어 추가로 시작한 크롤링 횟수", ["backend"]
+)
+CRAWL_BACKEND_RESULTS = Counter(
+    "crawl_backend_results_total", "리뷰를 가져온 크롤러 백엔드별 횟수", ["backend"]
+)
+CRAWLED_REVIEWS = Counter(
+    "crawled_reviews_total", "수집한 리뷰 수 (new: 새로 분석, known: 이전에 분석해 건너뜀)", ["kind"]
+)
+MODEL_READY = Gauge("sentiment_model_ready", "감정 분석 모델 준비 여부 (1이면 준비 완료)")
+
+
+class _CacheCollector:
+    """캐시/메모 객체의 hits, misses와 모델 정보를 수집 시점에 읽어 내보냄"""
+
+    def __init__(self):
+        self.caches = {}
+
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "캐시 적중 횟수", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "캐시 미스 횟수", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "캐시 적중률 (0~1)", labels=["cache"])
+        for name, cache in self.caches.items():
+            total = cache.hits + cache.misses
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            ratio.add_metric([name], cache.hits / total if total else 0.0)
+        yield hits
+        yield misses
+        yield ratio
+
+        model = InfoMetricFamily("sentiment_model", "감정 분석 모델과 추론 백엔드")
+        model.add_metric([], {
+            "model": sentiment.sentiment_memo.model_key,
+            "backend": sentiment.backend or sentiment.BACKEND,
+        })
+        yield model
+        if sentiment.load_seconds is not None:
+            yield GaugeMetricFamily(
+                "sentiment_model_load_seconds", "모델 로딩 소요 시간 (초)", value=sentiment.load_seconds
+            )
+
+
+_collector = _CacheCollector()
+REGISTRY.register(_collector)
+
+
+def register_cache(name, cache):
+    """hits/misses 속성이 있는 캐시를 cache 레이블 name으로 등록"""
+    _collector.caches[name] = cache
+
+
+def mount(app, path="/metrics"):
+    """FastAPI(Gradio) 앱에 Prometheus 지표 엔드포인트 추가"""
+    from fastapi import Response
+
+    def metrics_endpoint():
+        return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+    app.add_api_route(path, metrics_endpoint, methods=["GET"], include_in_schema=False)
+
+
+# 2️⃣ 요청별 트레이스
+_trace_lock = threading.Lock()
+_trace_file = None
+
+
+def _write_trace(record):
+    global _trace_file
+    line = json.dumps(record, ensure_ascii=False)
+    with _trace_lock:
+        if TRACE_LOG_PATH == "-":
+            print(line, file=sys.stdout, flush=True)
+            return
+        if _trace_file is None:
+            _trace_file = open(TRACE_LOG_PATH, "a", encoding="utf-8")
+        _trace_file.write(line + "\n")
+        _trace_file.flush()
+
+
+class RequestTrace:
+    """요청 하나의 단계별 시간을 히스토그램에 기록하고, 끝나면 트레이스 로그 한 줄을 남김"""
+
+    def __init__(self, movie_title, max_reviews):
+        self.id = uuid.uuid4().hex[:12]
+        self.source = "crawl"  # crawl / cache / stale / store / sample / empty / error / aspect
+        self.started = time.perf_counter()
+        self.record = {
+            "request_id": self.id,
+            "title": movie_title,
+            "max_reviews": int(max_reviews),
+            "stages": {},
+        }
+
+    def observe(self, stage, seconds):
+        STAGE_SECONDS.labels(stage).observe(seconds)
+        # 감정 분석처럼 여러 번 실행되는 단계는 합계를 남김
+        stages = self.record["stages"]
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록 실행 시간을 name 단계로 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def finish(self, **fields):
+        """결과 출처(source)별 전체 시간을 기록하고 트레이스 로그 출력"""
+        seconds = time.perf_counter() - self.started
+        REQUEST_SECONDS.labels(self.source).observe(seconds)
+        if TRACE_LOG_PATH:
+            self.record.update(fields, source=self.source, total_seconds=round(seconds, 4))
+            self.record["stages"] = {k: round(v, 4) for k, v in self.record["stages"].items()}
+            _write_trace(self.record)
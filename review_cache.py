@@ -0,0 +1,149 @@
+# 영화 제목별 분석 결과 캐시 (메모리 LRU + SQLite 디스크)
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# 캐시 설정 (환경 변수로 변경 가능)
+CACHE_PATH = os.environ.get("REVIEW_CACHE_PATH", "review_cache.sqlite3")
+CACHE_TTL = float(os.environ.get("REVIEW_CACHE_TTL", "3600"))  # 초
+# TTL이 지난 결과도 이 시간(초)까지는 보관해 크롤링이 실패했을 때 대신 보여줌
+STALE_TTL = float(os.environ.get("REVIEW_CACHE_STALE_TTL", "86400"))
+MAX_MEMORY_ITEMS = int(os.environ.get("REVIEW_CACHE_MEMORY_ITEMS", "256"))
+MAX_DISK_ITEMS = int(os.environ.get("REVIEW_CACHE_DISK_ITEMS", "10000"))
+
+
+def _to_json(value):
+    """JSON으로 바로 저장할 수 없는 numpy 배열/스칼라(확률 벡터 등)를 리스트/숫자로"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"JSON으로 저장할 수 없는 값입니다: {type(value).__name__}")
+
+
+def normalize_title(movie_title):
+    """'기생충 ', '기생충' 처럼 표기만 다른 제목이 같은 키가 되도록 정규화"""
+    title = unicodedata.normalize("NFC", movie_title)
+    return " ".join(title.split()).lower()
+
+
+class ReviewCache:
+    """분석 결과를 메모리(LRU)와 SQLite에 TTL과 함께 저장하는 2단계 캐시
+
+    메모리에는 자주 찾는 제목만 MAX_MEMORY_ITEMS개까지 두고, 디스크에는
+    MAX_DISK_ITEMS개까지 보관해 재시작 후에도 결과를 재사용합니다.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, stale_ttl=STALE_TTL,
+                 max_memory_items=MAX_MEMORY_ITEMS, max_disk_items=MAX_DISK_ITEMS):
+        self.ttl = ttl
+        self.stale_ttl = max(ttl, stale_ttl)
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS review_cache ("
+                " title TEXT NOT NULL,"
+                " max_reviews INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " PRIMARY KEY (title, max_reviews))"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_cache_created_at ON review_cache (created_at)"
+            )
+
+    def get(self, movie_title, max_reviews, allow_stale=False):
+        """캐시된 (results, crawl_msg) 반환, 없거나 만료되었으면 None
+
+        allow_stale이면 TTL이 지났더라도 stale_ttl 안의 결과를 반환합니다 (크롤링 실패 시 대체용).
+        """
+        key = (normalize_title(movie_title), int(max_reviews))
+        now = time.time()
+        max_age = self.stale_ttl if allow_stale else self.ttl
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at < max_age:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if now - created_at >= self.stale_ttl:
+                    del self._memory[key]
+
+            row = self._db.execute(
+                "SELECT created_at, payload FROM review_cache WHERE title = ? AND max_reviews = ?",
+                key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            created_at, payload = row
+            if now - created_at >= max_age:
+                if now - created_at >= self.stale_ttl:
+                    with self._db:
+                        self._db.execute(
+                            "DELETE FROM review_cache WHERE title = ? AND max_reviews = ?", key
+                        )
+                self.misses += 1
+                return None
+
+            data = json.loads(payload)
+            value = (data["results"], data["crawl_msg"])
+            self._remember(key, created_at, value)
+            self.hits += 1
+            return value
+
+    def set(self, movie_title, max_reviews, results, crawl_msg):
+        """분석 결과를 메모리와 디스크에 저장"""
+        key = (normalize_title(movie_title), int(max_reviews))
+        created_at = time.time()
+        payload = json.dumps({"results": results, "crawl_msg": crawl_msg}, ensure_ascii=False, default=_to_json)
+
+        with self._lock:
+            self._remember(key, created_at, (results, crawl_msg))
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO review_cache (title, max_reviews, created_at, payload)"
+                    " VALUES (?, ?, ?, ?)",
+                    (*key, created_at, payload)
+                )
+                # 디스크 용량 제한: 오래된 항목부터 삭제
+                self._db.execute(
+                    "DELETE FROM review_cache WHERE rowid IN ("
+                    " SELECT rowid FROM review_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_items,)
+                )
+
+    def invalidate(self, movie_title):
+        """해당 제목의 캐시를 모두 삭제"""
+        title = normalize_title(movie_title)
+        with self._lock:
+            for key in [k for k in self._memory if k[0] == title]:
+                del self._memory[key]
+            with self._db:
+                self._db.execute("DELETE FROM review_cache WHERE title = ?", (title,))
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            with self._db:
+                self._db.execute("DELETE FROM review_cache")
+
+    def _remember(self, key, created_at, value):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
@@ -0,0 +1,326 @@
+# 제목별로 지금까지 수집·분석한 리뷰 저장소 (SQLite)
+#
+# 재수집 시 새 리뷰만 분석하는 데 쓰고, 기간별 감정 통계를 다시 크롤링하지 않고 인덱스로 조회합니다.
+# 예) python review_store.py 기생충 --days 7
+
+import argparse
+import datetime
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import deque
+
+import numpy as np
+
+from review_cache import normalize_title
+
+# 저장소 설정 (환경 변수로 변경 가능)
+STORE_PATH = os.environ.get("REVIEW_STORE_PATH", "review_store.sqlite3")
+# 이미 본 리뷰가 나오면 더 넘기지 않고 저장된 결과와 합치는지 여부
+INCREMENTAL_CRAWL_ENABLED = os.environ.get("INCREMENTAL_CRAWL_ENABLED", "1") == "1"
+# 감정 추이의 이동 평균 기간 (일)
+TREND_ROLLING_DAYS = int(os.environ.get("TREND_ROLLING_DAYS", "7"))
+
+
+def review_hash(review):
+    """리뷰 본문의 해시 (공백/유니코드 표기 차이는 같은 리뷰로 취급)"""
+    text = " ".join(unicodedata.normalize("NFC", review).split())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ReviewStore:
+    """제목별 리뷰와 감정 분석 결과, 수집 기록을 보관하는 저장소
+
+    같은 제목을 다시 수집할 때 이미 분석한 리뷰(본문 해시)는 건너뛰고,
+    새 리뷰의 결과만 추가해 저장된 결과와 합쳐 보여줄 수 있도록 합니다.
+    리뷰마다 처음 수집한 시각(crawled_at)을 남겨 "최근 N일" 통계를 인덱스로 조회합니다.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # 조회(대시보드)와 쓰기(수집)가 서로 막지 않도록 WAL 모드 사용
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            # seen_at이 클수록, 같은 수집 안에서는 position이 작을수록 최신 리뷰
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS reviews ("
+                " title TEXT NOT NULL,"
+                " review_hash TEXT NOT NULL,"
+                " review TEXT NOT NULL,"
+                " sentiment TEXT NOT NULL,"
+                " score REAL NOT NULL,"
+                " seen_at REAL NOT NULL,"
+                " position INTEGER NOT NULL,"
+                " PRIMARY KEY (title, review_hash))"
+            )
+            # 이전 버전 저장소에는 수집 시각/수집 번호가 없으므로 열 추가 (기존 리뷰는 seen_at으로 채움)
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(reviews)")}
+            if "crawled_at" not in columns:
+                self._db.execute("ALTER TABLE reviews ADD COLUMN crawled_at REAL")
+                self._db.execute("UPDATE reviews SET crawled_at = seen_at")
+            if "crawl_id" not in columns:
+                self._db.execute("ALTER TABLE reviews ADD COLUMN crawl_id INTEGER")
+            # 클래스별 확률 (float32 배열 바이트)
+            if "probs" not in columns:
+                self._db.execute("ALTER TABLE reviews ADD COLUMN probs BLOB")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS crawls ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " title TEXT NOT NULL,"
+                " crawled_at REAL NOT NULL,"
+                " backend TEXT,"
+                " review_count INTEGER NOT NULL,"
+                " new_count INTEGER NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reviews_title_order ON reviews (title, seen_at DESC, position)"
+            )
+            # 기간별 통계는 이 인덱스만 읽고 끝나도록 sentiment, score까지 포함
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reviews_title_crawled ON reviews (title, crawled_at, sentiment, score)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reviews_sentiment_crawled ON reviews (sentiment, crawled_at)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_crawls_title_crawled ON crawls (title, crawled_at)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_reviews_crawl ON reviews (crawl_id)")
+            # 제목·날짜별 집계 (리뷰를 저장할 때 함께 갱신해 추이 조회는 날짜 수만큼만 읽음)
+            has_daily = self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_sentiment'"
+            ).fetchone()
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS daily_sentiment ("
+                " title TEXT NOT NULL,"
+                " day TEXT NOT NULL,"
+                " total INTEGER NOT NULL,"
+                " positive INTEGER NOT NULL,"
+                " negative INTEGER NOT NULL,"
+                " score_sum REAL NOT NULL,"
+                " PRIMARY KEY (title, day))"
+            )
+            if not has_daily:
+                # 집계 테이블이 없던 저장소는 기존 리뷰로 한 번만 채움
+                self._db.execute(
+                    "INSERT INTO daily_sentiment (title, day, total, positive, negative, score_sum)"
+                    " SELECT title, date(crawled_at, 'unixepoch', 'localtime'), COUNT(*),"
+                    " SUM(sentiment = '긍정'), SUM(sentiment = '부정'), SUM(score)"
+                    " FROM reviews GROUP BY 1, 2"
+                )
+
+    def known_hashes(self, movie_title):
+        """해당 제목에서 이미 분석한 리뷰 해시 집합"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT review_hash FROM reviews WHERE title = ?", (normalize_title(movie_title),)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def latest_results(self, movie_title, limit):
+        """저장된 결과를 최신순으로 최대 limit개 반환"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT review, sentiment, score, probs FROM reviews"
+                " WHERE title = ? ORDER BY seen_at DESC, position LIMIT ?",
+                (normalize_title(movie_title), int(limit))
+            ).fetchall()
+        return [_result(*row) for row in rows]
+
+    def add_results(self, movie_title, results, order=None, backend=None):
+        """수집 기록 한 건과 새로 분석한 결과를 한 트랜잭션으로 저장하고 수집 번호 반환
+
+        order는 이번 수집에서 본 리뷰 해시 목록(페이지 순서, 이미 분석한 리뷰 포함)입니다.
+        이 리뷰들은 모두 이번 수집 시각과 페이지 순서로 다시 정렬되므로, 페이지를 더 깊이
+        넘겨 찾은 예전 리뷰도 저장소 안에서 제자리를 찾습니다.
+        """
+        title = normalize_title(movie_title)
+        seen_at = time.time()
+        hashes = [review_hash(result["review"]) for result in results]
+        positions = {digest: position for position, digest in enumerate(order or hashes)}
+        # 결과에 있어도 이미 저장된 리뷰(INSERT OR IGNORE로 건너뜀)일 수 있으므로 이번에 본 리뷰 모두 갱신
+        # (새로 추가된 행은 같은 값으로 덮어씀)
+        seen = [(seen_at, position, title, digest) for digest, position in positions.items()]
+
+        with self._lock, self._db:
+            crawl_id = self._db.execute(
+                "INSERT INTO crawls (title, crawled_at, backend, review_count, new_count) VALUES (?, ?, ?, ?, ?)",
+                (title, seen_at, backend, len(positions), len(results))
+            ).lastrowid
+            self._db.executemany(
+                "INSERT OR IGNORE INTO reviews"
+                " (title, review_hash, review, sentiment, score, seen_at, position, crawled_at, crawl_id, probs)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (title, digest, result["review"], result["sentiment"], result["score"],
+                     seen_at, positions.get(digest, 0), seen_at, crawl_id, _probs_blob(result.get("probs")))
+                    for digest, result in zip(hashes, results)
+                    if result["sentiment"] != "오류"
+                ]
+            )
+            self._db.executemany(
+                "UPDATE reviews SET seen_at = ?, position = ? WHERE title = ? AND review_hash = ?", seen
+            )
+            # 이번 수집에서 실제로 추가된 리뷰만 날짜별 집계에 더함
+            self._db.execute(
+                "INSERT INTO daily_sentiment (title, day, total, positive, negative, score_sum)"
+                " SELECT title, date(crawled_at, 'unixepoch', 'localtime'), COUNT(*),"
+                " SUM(sentiment = '긍정'), SUM(sentiment = '부정'), SUM(score)"
+                " FROM reviews WHERE crawl_id = ? GROUP BY 1, 2"
+                " ON CONFLICT (title, day) DO UPDATE SET"
+                " total = total + excluded.total,"
+                " positive = positive + excluded.positive,"
+                " negative = negative + excluded.negative,"
+                " score_sum = score_sum + excluded.score_sum",
+                (crawl_id,)
+            )
+        return crawl_id
+
+    # 조회 함수 (크롤링 없이 저장된 결과만 사용)
+    def sentiment_summary(self, movie_title, days=7):
+        """최근 days일 동안 처음 수집한 리뷰의 감정 통계
+
+        반환: {"title", "days", "total", "positive", "negative", "positive_ratio", "average_score"}
+        """
+        title = normalize_title(movie_title)
+        since = time.time() - days * 86400
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT sentiment, COUNT(*), AVG(score) FROM reviews"
+                " WHERE title = ? AND crawled_at >= ? GROUP BY sentiment",
+                (title, since)
+            ).fetchall()
+
+        counts = {sentiment: (count, average) for sentiment, count, average in rows}
+        total = sum(count for count, _ in counts.values())
+        positive = counts.get("긍정", (0, None))[0]
+        return {
+            "title": title,
+            "days": days,
+            "total": total,
+            "positive": positive,
+            "negative": counts.get("부정", (0, None))[0],
+            "positive_ratio": positive / total if total else 0.0,
+            "average_score": sum(count * average for count, average in counts.values()) / total if total else 0.0,
+        }
+
+    def daily_trend(self, movie_title, days=365, rolling_days=TREND_ROLLING_DAYS):
+        """최근 days일의 날짜별 리뷰 수, 긍정 비율과 긍정 비율 이동 평균 (날짜별 집계만 읽음)
+
+        이동 평균은 rolling_days일 창 안의 긍정 수 합 / 리뷰 수 합으로 계산해 리뷰가 적은 날의 영향을 줄입니다.
+        반환: [{"day", "total", "positive", "negative", "positive_ratio", "rolling_ratio", "average_score"}, ...]
+        """
+        since = time.strftime("%Y-%m-%d", time.localtime(time.time() - days * 86400))
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT day, total, positive, negative, score_sum FROM daily_sentiment"
+                " WHERE title = ? AND day > ? ORDER BY day",
+                (normalize_title(movie_title), since)
+            ).fetchall()
+
+        trend = []
+        window = deque()
+        for day, total, positive, negative, score_sum in rows:
+            # 창에서 rolling_days일보다 오래된 날짜 제거 (수집하지 않은 날은 행이 없음)
+            window.append((day, total, positive))
+            oldest = _shift_day(day, -(rolling_days - 1))
+            while window[0][0] < oldest:
+                window.popleft()
+            window_total = sum(item[1] for item in window)
+            trend.append({
+                "day": day,
+                "total": total,
+                "positive": positive,
+                "negative": negative,
+                "positive_ratio": positive / total if total else 0.0,
+                "rolling_ratio": sum(item[2] for item in window) / window_total if window_total else 0.0,
+                "average_score": score_sum / total if total else 0.0,
+            })
+        return trend
+
+    def reviews_since(self, movie_title, days=7, sentiment=None, limit=100):
+        """최근 days일 동안 처음 수집한 리뷰를 최근 수집순으로 (sentiment를 주면 긍정/부정만)"""
+        query = (
+            "SELECT review, sentiment, score, probs FROM reviews WHERE title = ? AND crawled_at >= ?"
+            + (" AND sentiment = ?" if sentiment else "")
+            + " ORDER BY crawled_at DESC, position LIMIT ?"
+        )
+        params = [normalize_title(movie_title), time.time() - days * 86400]
+        if sentiment:
+            params.append(sentiment)
+        params.append(int(limit))
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [_result(*row) for row in rows]
+
+    def crawl_history(self, movie_title, limit=30):
+        """해당 제목의 최근 수집 기록 (수집 시각, 백엔드, 본 리뷰 수, 새 리뷰 수)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT crawled_at, backend, review_count, new_count FROM crawls"
+                " WHERE title = ? ORDER BY crawled_at DESC LIMIT ?",
+                (normalize_title(movie_title), int(limit))
+            ).fetchall()
+        return [
+            {"crawled_at": crawled_at, "backend": backend, "review_count": review_count, "new_count": new_count}
+            for crawled_at, backend, review_count, new_count in rows
+        ]
+
+    def titles(self):
+        """저장된 제목 목록 (리뷰가 많은 순)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT title, COUNT(*) FROM reviews GROUP BY title ORDER BY COUNT(*) DESC"
+            ).fetchall()
+        return [title for title, _ in rows]
+
+
+def _shift_day(day, offset):
+    """'YYYY-MM-DD' 날짜를 offset일 이동"""
+    return (datetime.date.fromisoformat(day) + datetime.timedelta(days=offset)).isoformat()
+
+
+def _probs_blob(probs):
+    return None if probs is None else np.asarray(probs, dtype=np.float32).tobytes()
+
+
+def _result(review, sentiment, score, probs=None):
+    """저장된 행을 analyze_sentiment_batch 결과와 같은 모양의 딕셔너리로"""
+    return {
+        "review": review,
+        "sentiment": sentiment,
+        "emoji": "😊" if sentiment == "긍정" else "😞",
+        "score": score,
+        "confidence": f"{score:.1%}",
+        "probs": None if probs is None else np.frombuffer(probs, dtype=np.float32)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 리뷰로 제목별 최근 감정 통계를 출력합니다.")
+    parser.add_argument("title", nargs="?", help="영화 제목 (생략하면 저장된 제목 목록)")
+    parser.add_argument("--days", type=float, default=7, help="최근 며칠 동안 수집한 리뷰 (기본: 7)")
+    parser.add_argument("--path", default=STORE_PATH, help=f"저장소 경로 (기본: {STORE_PATH})")
+    args = parser.parse_args(argv)
+
+    store = ReviewStore(args.path)
+    if not args.title:
+        for title in store.titles():
+            print(title)
+        return
+
+    summary = store.sentiment_summary(args.title, args.days)
+    print(f"📊 '{summary['title']}' 최근 {args.days:g}일: 리뷰 {summary['total']}개")
+    print(f"  😊 긍정 {summary['positive']}개 ({summary['positive_ratio']:.1%}) / 😞 부정 {summary['negative']}개")
+    print(f"  평균 확신도 {summary['average_score']:.1%}")
+    for crawl in store.crawl_history(args.title, limit=5):
+        crawled_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(crawl["crawled_at"]))
+        print(f"  • {crawled_at} {crawl['backend']}: 리뷰 {crawl['review_count']}개 중 새 리뷰 {crawl['new_count']}개")
+
+
+if __name__ == "__main__":
+    main()
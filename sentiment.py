@@ -0,0 +1,500 @@
+# 한국어 감정 분석 모델 로딩 및 배치 추론
+# torch/transformers는 import만으로 수 초가 걸리므로 모델을 처음 쓸 때(또는 백그라운드 예열 시) 불러옴
+
+import asyncio
+import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+MODEL_NAME = "WhitePeak/bert-base-cased-Korean-sentiment"
+FALLBACK_MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+
+# 배치 추론 설정 (환경 변수로 변경 가능)
+BATCH_SIZE = int(os.environ.get("SENTIMENT_BATCH_SIZE", "16"))
+# 모델에 실제로 넣은 배치의 크기를 받는 콜백 (metrics가 지표 기록용으로 설정)
+on_batch = None
+
+# 리뷰별 결과 메모이제이션 설정 (경로를 지정하면 SQLite에 영속화)
+MEMO_MAX_ITEMS = int(os.environ.get("SENTIMENT_MEMO_ITEMS", "100000"))
+MEMO_PATH = os.environ.get("SENTIMENT_MEMO_PATH") or None
+
+# 추론 백엔드: torch(기본), torch-int8(동적 양자화), onnx, onnx-int8 (onnx/onnxruntime 필요)
+BACKEND = os.environ.get("SENTIMENT_BACKEND", "torch")
+ONNX_DIR = os.environ.get("SENTIMENT_ONNX_DIR", "onnx_models")
+# torch 기준 결과와 레이블 일치율이 이보다 낮으면 torch 백엔드로 되돌림
+MIN_BACKEND_AGREEMENT = float(os.environ.get("SENTIMENT_MIN_AGREEMENT", "0.95"))
+
+POSITIVE_LABELS = ["LABEL_1", "POSITIVE", "positive"]
+# 최고 확률(score)이 이보다 낮은 리뷰는 "불확실"로 분류 (사람이 다시 확인할 대상)
+UNCERTAIN_THRESHOLD = float(os.environ.get("SENTIMENT_UNCERTAIN_THRESHOLD", "0.7"))
+
+# 백엔드 정확도 확인용 리뷰 (긍정/부정/혼합, 짧은 리뷰/긴 리뷰)
+ACCURACY_FIXTURE = [
+    "정말 재미있는 영화였어요. 추천합니다!",
+    "배우들의 연기력이 정말 뛰어나고 스토리텔링도 완벽해요.",
+    "시간 가는 줄 모르고 봤습니다. 인생 영화예요.",
+    "최고",
+    "재밌어요 ㅎㅎ",
+    "너무 길고 뻔한 스토리라 조금 지루했어요.",
+    "돈이 아까운 영화. 두 번은 못 보겠네요.",
+    "연출이 산만하고 결말이 허무합니다.",
+    "별로",
+    "스토리는 괜찮았는데 연출이 아쉬웠어요.",
+    "예상보다 지루했지만 나쁘지 않았어요.",
+    "음악은 좋았지만 배우들의 연기가 어색해서 몰입이 안 됐어요.",
+]
+
+# 모델 로딩 후 채워지는 상태 (load_model 참고)
+sentiment_pipeline = None
+MAX_LENGTH = 512
+backend = None
+load_seconds = None  # 모델 로딩에 걸린 시간 (초)
+_run_logits = None
+_ready = threading.Event()
+_load_lock = threading.Lock()
+
+
+# 1️⃣ 결과 정규화 및 배치 추론
+def make_result(review, label, score, probs=None):
+    """모델 레이블을 긍정/부정으로 정규화한 결과 딕셔너리 생성
+
+    probs는 클래스별 확률(float32 배열, 모델 id2label 순서)입니다.
+    """
+    if label in POSITIVE_LABELS:
+        sentiment = "긍정"
+        emoji = "😊"
+    else:
+        sentiment = "부정"
+        emoji = "😞"
+
+    return {
+        "review": review,
+        "sentiment": sentiment,
+        "emoji": emoji,
+        "score": score,
+        "confidence": f"{score:.1%}",
+        "probs": probs
+    }
+
+
+def error_result(review):
+    """분석 실패한 리뷰의 결과 딕셔너리"""
+    return {
+        "review": review,
+        "sentiment": "오류",
+        "emoji": "❓",
+        "score": 0.0,
+        "confidence": "0%",
+        "probs": None
+    }
+
+
+def _forward(features):
+    """패딩된 배치를 모델에 한번 통과시켜 (레이블, 점수, 클래스별 확률) 목록 반환"""
+    model = sentiment_pipeline.model
+    batch = sentiment_pipeline.tokenizer.pad(features, return_tensors="pt")
+    batch = {k: v.to(model.device) for k, v in batch.items()}
+
+    probs = _run_logits(batch).float().softmax(dim=-1)
+
+    scores, label_ids = probs.max(dim=-1)
+    # 확률 벡터는 float32 배열 한 덩어리로 옮기고 행 단위로 나눠 줌
+    rows = probs.cpu().numpy().astype(np.float32, copy=False)
+    return [
+        (model.config.id2label[label_id], score, row)
+        for label_id, score, row in zip(label_ids.tolist(), scores.tolist(), rows)
+    ]
+
+
+def _predict_single(review):
+    """리뷰 하나만 분석 (배치 실패 시 오류 격리용), 실패하면 None"""
+    try:
+        return _forward([sentiment_pipeline.tokenizer(review, truncation=True, max_length=MAX_LENGTH)])[0]
+    except Exception:
+        return None
+
+
+def _predict_texts(texts, batch_size):
+    """텍스트 목록을 길이별 배치로 추론해 입력 순서대로 (레이블, 점수, 확률) 또는 None 반환
+
+    전체를 한번에 토큰화한 뒤 토큰 길이순으로 정렬해 batch_size 단위로 동적
+    패딩합니다. 배치가 실패하면 해당 배치만 하나씩 다시 분석합니다.
+    """
+    predictions = [None] * len(texts)
+
+    try:
+        encodings = sentiment_pipeline.tokenizer(texts, truncation=True, max_length=MAX_LENGTH)
+    except Exception:
+        return [_predict_single(text) for text in texts]
+
+    # 길이별 버킷: 비슷한 길이끼리 묶어 짧은 리뷰가 긴 리뷰 길이로 패딩되지 않도록 함
+    order = sorted(range(len(texts)), key=lambda j: len(encodings["input_ids"][j]))
+
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        features = [{key: encodings[key][j] for key in encodings.keys()} for j in chunk]
+        if on_batch is not None:
+            on_batch(len(chunk))
+
+        try:
+            batch_predictions = _forward(features)
+        except Exception:
+            batch_predictions = [_predict_single(texts[j]) for j in chunk]
+
+        for j, prediction in zip(chunk, batch_predictions):
+            predictions[j] = prediction
+
+    return predictions
+
+
+# 2️⃣ 추론 백엔드 선택
+def _torch_logits(model):
+    """PyTorch 모델로 logits를 계산하는 함수 반환"""
+    import torch
+
+    def run(batch):
+        with torch.inference_mode():
+            return model(**batch).logits
+    return run
+
+
+def _export_onnx(model, tokenizer, quantize=False):
+    """모델을 ONNX로 내보낸 파일 경로 반환 (quantize면 int8 동적 양자화, 이미 있으면 재사용)"""
+    import torch
+
+    name = model.config.name_or_path.replace("/", "--")
+    path = os.path.join(ONNX_DIR, f"{name}.onnx")
+
+    if not os.path.exists(path):
+        os.makedirs(ONNX_DIR, exist_ok=True)
+        encoded = tokenizer(["더미 입력 문장입니다"], return_tensors="pt")
+        # ONNX 입력 이름은 forward() 인자 순서와 같아야 함
+        dummy = {
+            name: encoded[name]
+            for name in inspect.signature(model.forward).parameters
+            if name in encoded
+        }
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in dummy}
+        dynamic_axes["logits"] = {0: "batch"}
+        torch.onnx.export(
+            model.eval(),
+            (),
+            path,
+            kwargs=dummy,
+            input_names=list(dummy),
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False
+        )
+
+    if not quantize:
+        return path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = os.path.join(ONNX_DIR, f"{name}.int8.onnx")
+    if not os.path.exists(quantized_path):
+        quantize_dynamic(path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def _onnx_logits(path):
+    """ONNX Runtime 세션으로 logits를 계산하는 함수 반환"""
+    import onnxruntime as ort
+    import torch
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+    input_names = {i.name for i in session.get_inputs()}
+
+    def run(batch):
+        feeds = {k: v.cpu().numpy() for k, v in batch.items() if k in input_names}
+        return torch.from_numpy(session.run(["logits"], feeds)[0])
+    return run
+
+
+def load_backend(name):
+    """백엔드 이름에 맞는 logits 함수 생성"""
+    import torch
+
+    model = sentiment_pipeline.model
+    if name == "torch":
+        return _torch_logits(model)
+    if name == "torch-int8":
+        quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return _torch_logits(quantized)
+    if name in ("onnx", "onnx-int8"):
+        return _onnx_logits(_export_onnx(model, sentiment_pipeline.tokenizer, quantize=name == "onnx-int8"))
+    raise ValueError(f"알 수 없는 백엔드입니다: {name}")
+
+
+def compare_backends(run_logits, reference_logits, texts=ACCURACY_FIXTURE):
+    """두 백엔드의 (레이블 일치율, 최대 확률 차이) 반환"""
+    batch = dict(sentiment_pipeline.tokenizer(
+        texts, padding=True, truncation=True, max_length=MAX_LENGTH, return_tensors="pt"
+    ))
+    probs = run_logits(batch).softmax(dim=-1)
+    reference = reference_logits(batch).softmax(dim=-1)
+
+    agreement = (probs.argmax(dim=-1) == reference.argmax(dim=-1)).float().mean().item()
+    max_delta = (probs - reference).abs().max().item()
+    return agreement, max_delta
+
+
+def _select_backend():
+    """BACKEND 설정에 맞는 (logits 함수, 백엔드 이름) 반환, 실패하거나 정확도가 낮으면 torch"""
+    reference = _torch_logits(sentiment_pipeline.model)
+    if BACKEND == "torch":
+        return reference, "torch"
+
+    try:
+        candidate = load_backend(BACKEND)
+        agreement, max_delta = compare_backends(candidate, reference)
+        print(f"🔍 {BACKEND} 백엔드 정확도: 레이블 일치율 {agreement:.1%}, 최대 확률 차이 {max_delta:.4f}")
+        if agreement >= MIN_BACKEND_AGREEMENT:
+            return candidate, BACKEND
+        print("torch 결과와 차이가 커서 torch 백엔드를 사용합니다...")
+    except Exception as e:
+        print(f"{BACKEND} 백엔드 로딩 실패: {e}")
+        print("torch 백엔드를 사용합니다...")
+
+    return reference, "torch"
+
+
+# 3️⃣ 리뷰별 결과 메모이제이션
+class SentimentMemo:
+    """정규화한 리뷰 텍스트 해시 → (레이블, 점수, 클래스별 확률) LRU 캐시
+
+    키에 모델 이름과 리비전을 포함하므로 모델이 바뀌면 이전 결과는 쓰지 않습니다.
+    path를 주면 SQLite에도 저장해 재시작 후에도 재사용합니다.
+    """
+
+    def __init__(self, model_key, max_items=MEMO_MAX_ITEMS, path=MEMO_PATH):
+        self.model_key = model_key
+        # 실제로 로딩한 모델 이름/리비전/백엔드로 키를 정했는지 여부 (정하기 전에는 메모를 쓰지 않음)
+        self.resolved = False
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS sentiment_memo ("
+                    " key TEXT PRIMARY KEY, label TEXT NOT NULL, score REAL NOT NULL, probs BLOB)"
+                )
+                # 확률 벡터가 없던 이전 메모에는 열 추가 (확률이 없는 항목은 다시 추론)
+                columns = {row[1] for row in self._db.execute("PRAGMA table_info(sentiment_memo)")}
+                if "probs" not in columns:
+                    self._db.execute("ALTER TABLE sentiment_memo ADD COLUMN probs BLOB")
+
+    @property
+    def persistent(self):
+        """SQLite에도 저장하는지 여부 (조회/저장에 디스크 I/O가 있음)"""
+        return self._db is not None
+
+    def set_model_key(self, model_key):
+        """모델 로딩 후 실제 이름/리비전/백엔드로 키 확정"""
+        self.model_key = model_key
+        self.resolved = True
+
+    def key(self, review):
+        """공백/유니코드 표기 차이를 없앤 텍스트와 모델 정보로 해시 키 생성"""
+        text = " ".join(unicodedata.normalize("NFC", review).split())
+        return hashlib.blake2b(f"{self.model_key}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key):
+        """저장된 (레이블, 점수, 확률) 반환, 없으면 None"""
+        with self._lock:
+            prediction = self._memory.get(key)
+            if prediction is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return prediction
+            if self._db is None:
+                self.misses += 1
+                return None
+
+            row = self._db.execute(
+                "SELECT label, score, probs FROM sentiment_memo WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[2] is None:
+                self.misses += 1
+                return None
+            label, score, probs = row
+            prediction = (label, score, np.frombuffer(probs, dtype=np.float32))
+            self._remember(key, prediction)
+            self.hits += 1
+            return prediction
+
+    def put_many(self, items):
+        """[(key, (레이블, 점수, 확률)), ...] 저장"""
+        with self._lock:
+            for key, prediction in items:
+                self._remember(key, prediction)
+            if self._db is not None:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO sentiment_memo (key, label, score, probs) VALUES (?, ?, ?, ?)",
+                        [
+                            (key, label, score, np.asarray(probs, dtype=np.float32).tobytes())
+                            for key, (label, score, probs) in items
+                        ]
+                    )
+
+    def clear(self):
+        """메모 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM sentiment_memo")
+
+    def _remember(self, key, prediction):
+        self._memory[key] = tuple(prediction)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+
+# 모델 없이도 조회할 수 있도록 설정값으로 먼저 만들고, 모델을 로딩하면 실제 이름/리비전/백엔드로 키를 갱신
+# (워커 프로세스에서 추론하는 경우 이 프로세스는 모델을 로딩하지 않고, 워커가 알려준 키로 갱신)
+sentiment_memo = SentimentMemo(f"{MODEL_NAME}:{BACKEND}")
+
+
+# 4️⃣ 한국어 감정 분석 파이프라인 생성 (지연 로딩)
+def load_model():
+    """모델을 한번만 로딩 (다른 스레드가 로딩 중이면 끝날 때까지 대기)"""
+    global sentiment_pipeline, MAX_LENGTH, backend, load_seconds, _run_logits
+
+    with _load_lock:
+        if _ready.is_set():
+            return
+
+        started = time.perf_counter()
+        from transformers import pipeline
+
+        print("🤖 한국어 감정 분석 모델 로딩 중...")
+        try:
+            sentiment_pipeline = pipeline("sentiment-analysis", model=MODEL_NAME)
+        except Exception as e:
+            print(f"모델 로딩 실패: {e}")
+            print("대안 모델을 사용합니다...")
+            sentiment_pipeline = pipeline("sentiment-analysis", model=FALLBACK_MODEL_NAME)
+
+        print("✅ 모델 로딩 완료!")
+        MAX_LENGTH = min(sentiment_pipeline.tokenizer.model_max_length, 512)
+
+        _run_logits, backend = _select_backend()
+
+        config = sentiment_pipeline.model.config
+        sentiment_memo.set_model_key(
+            f"{config.name_or_path}@{getattr(config, '_commit_hash', None) or 'local'}:{backend}"
+        )
+
+        load_seconds = time.perf_counter() - started
+        print(f"⚙️ 추론 백엔드: {backend} (모델 준비 {load_seconds:.2f}초)")
+        _ready.set()
+
+
+def warm_up_in_background():
+    """서버를 띄운 뒤 첫 요청 전에 모델이 준비되도록 별도 스레드에서 로딩 시작"""
+    thread = threading.Thread(target=load_model, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready():
+    """모델 로딩이 끝났는지 여부"""
+    return _ready.is_set()
+
+
+# 5️⃣ 배치 감정 분석
+def _lookup_memo(reviews, use_memo=True):
+    """(결과 목록, 메모 키 → 리뷰 인덱스 목록) 반환, 메모에 없는 리뷰의 결과는 None
+
+    use_memo가 False면 메모를 조회하지 않고 같은 텍스트만 한 번으로 묶습니다.
+    """
+    results = [None] * len(reviews)
+    pending = {}
+
+    for i, review in enumerate(reviews):
+        # 문자열이 아니거나 빈 리뷰는 모델에 보내지 않음
+        if not (isinstance(review, str) and review.strip()):
+            results[i] = error_result(review)
+            continue
+
+        key = sentiment_memo.key(review)
+        prediction = sentiment_memo.get(key) if use_memo else None
+        if prediction is not None:
+            results[i] = make_result(review, *prediction)
+        else:
+            pending.setdefault(key, []).append(i)
+
+    return results, pending
+
+
+def _fill_predictions(reviews, results, pending, predictions, use_memo=True):
+    """추론 결과를 같은 텍스트의 리뷰 모두에 채우고 메모에 저장"""
+    for key, prediction in zip(pending, predictions):
+        for i in pending[key]:
+            results[i] = error_result(reviews[i]) if prediction is None else make_result(reviews[i], *prediction)
+
+    if not use_memo:
+        return
+    sentiment_memo.put_many([
+        (key, prediction) for key, prediction in zip(pending, predictions) if prediction is not None
+    ])
+
+
+def analyze_sentiment_batch(reviews, batch_size=BATCH_SIZE):
+    """여러 리뷰를 한번에 감정 분석
+
+    이미 분석한 텍스트는 sentiment_memo에서 바로 가져오고, 처음 보는 텍스트만
+    (중복 제거 후) 배치 추론합니다. 잘못된 입력은 해당 리뷰만 오류로 표시합니다.
+    """
+    load_model()
+
+    results, pending = _lookup_memo(reviews)
+    if pending:
+        predictions = _predict_texts([reviews[indices[0]] for indices in pending.values()], batch_size)
+        _fill_predictions(reviews, results, pending, predictions)
+
+    return results
+
+
+async def analyze_sentiment_batch_async(reviews, predict):
+    """analyze_sentiment_batch와 같지만 메모에 없는 텍스트는 await predict(texts)로 추론
+
+    predict는 텍스트 목록을 받아 같은 순서의 (레이블, 점수, 확률) 또는 None 목록을 돌려주는
+    코루틴 함수입니다 (예: InferencePool.predict).
+    워커가 어떤 모델/백엔드를 로딩했는지 알기 전에는 다른 모델의 결과가 섞이지 않도록
+    메모를 읽지도 쓰지도 않습니다.
+    """
+    use_memo = sentiment_memo.resolved
+    # SQLite 메모 조회/저장은 이벤트 루프를 막지 않도록 스레드에서 실행
+    offload = use_memo and sentiment_memo.persistent
+    if offload:
+        results, pending = await asyncio.to_thread(_lookup_memo, reviews, use_memo)
+    else:
+        results, pending = _lookup_memo(reviews, use_memo)
+    if pending:
+        predictions = await predict([reviews[indices[0]] for indices in pending.values()])
+        if offload:
+            await asyncio.to_thread(_fill_predictions, reviews, results, pending, predictions, use_memo)
+        else:
+            _fill_predictions(reviews, results, pending, predictions, use_memo)
+
+    return results
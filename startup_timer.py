@@ -0,0 +1,31 @@
+# 앱 시작 단계별 소요 시간 기록
+
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """시작 단계별 소요 시간을 기록하고 한번에 출력"""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = []
+
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name):
+        """with 블록 실행 시간을 name 단계로 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def report(self):
+        """단계별 소요 시간 요약 문자열"""
+        lines = [f"⏱️ 시작 시간 (총 {time.perf_counter() - self.started:.2f}초)"]
+        for name, seconds in self.phases:
+            lines.append(f"  • {name}: {seconds:.2f}초")
+        return "\n".join(lines)